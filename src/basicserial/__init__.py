@@ -4,7 +4,10 @@
 
 from .json import (
     to_json,
+    iter_to_json,
     from_json,
+    from_jsonl,
+    JsonFeedParser,
     IMPLEMENTATIONS as JSON_IMPLEMENTATIONS,
 )
 
@@ -17,9 +20,43 @@ from .toml import (
 from .yaml import (
     to_yaml,
     from_yaml,
+    from_yaml_all,
     IMPLEMENTATIONS as YAML_IMPLEMENTATIONS,
 )
 
+from .shapes import (
+    compile_encoder,
+)
+
+from .transcode import (
+    transcode,
+)
+
+from .hashing import (
+    fingerprint,
+)
+
+from .preload import (
+    warmup,
+)
+
+from .util import (
+    EncodeMemo,
+    InternTable,
+    LimitExceededError,
+)
+
+from .index import (
+    JsonlIndex,
+)
+
+from .files import (
+    open_compressed,
+    iter_file,
+    load_file,
+    dump_file,
+)
+
 SUPPORTED_JSON_PACKAGES = JSON_IMPLEMENTATIONS.registered_packages
 AVAILABLE_JSON_PACKAGES = JSON_IMPLEMENTATIONS.available_packages
 SUPPORTED_YAML_PACKAGES = YAML_IMPLEMENTATIONS.registered_packages
@@ -29,12 +66,17 @@ AVAILABLE_TOML_PACKAGES = TOML_IMPLEMENTATIONS.available_packages
 
 __all__ = (
     'to_json',
+    'iter_to_json',
     'from_json',
+    'from_jsonl',
+    'JsonFeedParser',
+    'JsonlIndex',
     'SUPPORTED_JSON_PACKAGES',
     'AVAILABLE_JSON_PACKAGES',
 
     'to_yaml',
     'from_yaml',
+    'from_yaml_all',
     'SUPPORTED_YAML_PACKAGES',
     'AVAILABLE_YAML_PACKAGES',
 
@@ -42,4 +84,16 @@ __all__ = (
     'from_toml',
     'SUPPORTED_TOML_PACKAGES',
     'AVAILABLE_TOML_PACKAGES',
+
+    'compile_encoder',
+    'transcode',
+    'fingerprint',
+    'warmup',
+    'LimitExceededError',
+    'EncodeMemo',
+    'InternTable',
+    'open_compressed',
+    'iter_file',
+    'load_file',
+    'dump_file',
 )
@@ -0,0 +1,411 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+
+from collections.abc import Iterator
+
+from .json import (
+    IMPLEMENTATIONS as JSON_IMPLEMENTATIONS,
+    JsonFeedParser,
+    iter_to_json,
+    to_json,
+)
+from .toml import (
+    to_toml,
+    from_toml,
+)
+from .yaml import (
+    IMPLEMENTATIONS as YAML_IMPLEMENTATIONS,
+    to_yaml,
+)
+
+
+# compression: (magic bytes, file extensions, opener)
+COMPRESSIONS = {
+    'gzip': (b'\x1f\x8b', ('.gz', '.gzip'), gzip.open),
+    'bz2': (b'BZh', ('.bz2',), bz2.open),
+    'xz': (b'\xfd7zXZ\x00', ('.xz', '.lzma'), lzma.open),
+}
+
+FORMAT_EXTENSIONS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.toml': 'toml',
+}
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+MAGIC_SIZE = max(len(magic) for magic, _, _ in COMPRESSIONS.values())
+
+
+def _get_name(file):
+    if _is_path(file):
+        return os.fsdecode(file)
+    name = getattr(file, 'name', None)
+    return name if isinstance(name, str) else ''
+
+
+def _split_extension(name):
+    name, extension = os.path.splitext(name)
+    return name, extension.lower()
+
+
+def _compression_from_name(name):
+    extension = _split_extension(name)[1]
+    for compression, (_, extensions, _) in COMPRESSIONS.items():
+        if extension in extensions:
+            return compression
+    return None
+
+
+def _compression_from_magic(header):
+    for compression, (magic, _, _) in COMPRESSIONS.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def _check_compression(compression):
+    if compression not in (None, False) and compression not in COMPRESSIONS:
+        raise ValueError(
+            '"%s" is not a supported compression' % (compression,)
+        )
+
+
+def _get_format(file, format):  # noqa: redefined-builtin
+    if format is None:
+        name = _get_name(file)
+        if _compression_from_name(name):
+            name = _split_extension(name)[0]
+        format = FORMAT_EXTENSIONS.get(_split_extension(name)[1])
+        if format is None:
+            raise ValueError(
+                'Could not determine the format of "%s"' % (name,)
+            )
+    elif format not in FORMAT_EXTENSIONS.values():
+        raise ValueError('"%s" is not a supported format' % (format,))
+    return format
+
+
+def _is_path(file):
+    return isinstance(file, (str, bytes, os.PathLike))
+
+
+def _read_header(file):
+    if _is_path(file):
+        with open(file, 'rb') as stream:
+            return stream.read(MAGIC_SIZE)
+    if hasattr(file, 'peek'):
+        return file.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    if file.seekable():
+        pos = file.tell()
+        header = file.read(MAGIC_SIZE)
+        file.seek(pos)
+        return header
+    raise ValueError(
+        'Cannot detect the compression of a stream that cannot be rewound'
+    )
+
+
+def open_compressed(file, mode='rb', compression=None):
+    """
+    Opens a file for binary reading or writing, transparently decompressing
+    or compressing it with gzip, bz2, or xz. Data is (de)compressed
+    incrementally as it is read or written.
+
+    When reading, the compression is detected from the first bytes of the
+    file; when writing, it is chosen by the extension of the file name
+    (``.gz``, ``.bz2``, ``.xz``).
+
+    :param file:
+        the path to the file, or a file-like object open in binary mode (which
+        is returned as-is if it is not compressed, and is otherwise left open
+        when the returned object is closed)
+    :param mode: ``rb`` or ``wb``; if not specified, defaults to ``rb``
+    :type mode: str
+    :param compression:
+        the compression to use (``gzip``, ``bz2``, or ``xz``), or ``False``
+        for none; if not specified, it is detected
+    :type compression: str
+    :returns: a file-like object open in binary mode
+    """
+
+    if mode not in ('rb', 'wb'):
+        raise ValueError('"%s" is not a supported mode' % (mode,))
+    _check_compression(compression)
+
+    if compression is None:
+        if mode == 'rb':
+            compression = _compression_from_magic(_read_header(file))
+        else:
+            compression = _compression_from_name(_get_name(file))
+
+    if compression:
+        return COMPRESSIONS[compression][2](file, mode)
+    if _is_path(file):
+        return open(file, mode)  # noqa: consider-using-with
+    return file
+
+
+class _Opened:
+    def __init__(self, file, mode, compression):
+        self._file = file
+        self._mode = mode
+        self._compression = compression
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = open_compressed(
+            self._file,
+            mode=self._mode,
+            compression=self._compression,
+        )
+        return self._stream
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._stream is not self._file:
+            self._stream.close()
+        elif self._mode == 'wb':
+            self._stream.flush()
+
+
+def _iter_text(stream):
+    # Decode a binary stream without letting the wrapper close it.
+    text = io.TextIOWrapper(stream, encoding='utf-8')
+    try:
+        yield text
+    finally:
+        text.detach()
+
+
+def _iter_json(stream, pkg, native_datetimes, array_items):
+    parser = JsonFeedParser(
+        native_datetimes=native_datetimes,
+        pkg=pkg,
+        array_items=array_items,
+    )
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def _iter_jsonl(stream, pkg, native_datetimes):
+    impl = JSON_IMPLEMENTATIONS.get(pkg)
+    for line in stream:
+        if line.strip():
+            yield impl.deserialize(line, native_datetimes=native_datetimes)
+
+
+def iter_file(
+        file,
+        format=None,  # noqa: redefined-builtin
+        pkg=None,
+        native_datetimes=True,
+        compression=None,
+        array_items=False):
+    """
+    Reads the documents in a (possibly compressed) file one at a time,
+    without decompressing the whole file into memory first.
+
+    JSON files may hold several concatenated documents. YAML files may hold
+    several documents separated by ``---``. TOML files are always read in
+    full, as a single document.
+
+    :param file:
+        the path to the file, or a file-like object open in binary mode
+    :param format:
+        the format of the file (``json``, ``jsonl``, ``yaml``, or ``toml``);
+        if not specified, it is determined by the extension of the file name
+        (ignoring any compression extension)
+    :type format: str
+    :param pkg:
+        the package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param compression:
+        the compression of the file (``gzip``, ``bz2``, or ``xz``), or
+        ``False`` for none; if not specified, it is detected
+    :type compression: str
+    :param array_items:
+        for JSON, whether the file holds a single top-level array whose
+        elements should be returned one at a time; if not specified, defaults
+        to ``False``
+    :type array_items: bool
+    """
+
+    format = _get_format(file, format)
+    _check_compression(compression)
+
+    with _Opened(file, 'rb', compression) as stream:
+        if format == 'json':
+            yield from _iter_json(stream, pkg, native_datetimes, array_items)
+
+        elif format == 'jsonl':
+            yield from _iter_jsonl(stream, pkg, native_datetimes)
+
+        elif format == 'yaml':
+            impl = YAML_IMPLEMENTATIONS.get(pkg)
+            for text in _iter_text(stream):
+                yield from impl.deserialize_all(
+                    text,
+                    native_datetimes=native_datetimes,
+                )
+
+        else:
+            yield from_toml(
+                stream.read().decode('utf-8'),
+                native_datetimes=native_datetimes,
+                pkg=pkg,
+            )
+
+
+def load_file(
+        file,
+        format=None,  # noqa: redefined-builtin
+        pkg=None,
+        native_datetimes=True,
+        compression=None):
+    """
+    Reads a (possibly compressed) file, decompressing it incrementally as it
+    is parsed.
+
+    :param file:
+        the path to the file, or a file-like object open in binary mode
+    :param format:
+        the format of the file (``json``, ``jsonl``, ``yaml``, or ``toml``);
+        if not specified, it is determined by the extension of the file name
+        (ignoring any compression extension)
+    :type format: str
+    :param pkg:
+        the package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param compression:
+        the compression of the file (``gzip``, ``bz2``, or ``xz``), or
+        ``False`` for none; if not specified, it is detected
+    :type compression: str
+    :returns: the document in the file, or a list of the documents for JSON
+        Lines
+    :raises ValueError: if a JSON or YAML file doesn't hold exactly one
+        document
+    """
+
+    format = _get_format(file, format)
+
+    if format == 'json':
+        # A single document has to be held in full anyway, so skip the
+        # incremental scanning and decode the decompressed text in one go.
+        _check_compression(compression)
+        with _Opened(file, 'rb', compression) as stream:
+            return JSON_IMPLEMENTATIONS.get(pkg).deserialize(
+                stream.read(),
+                native_datetimes=native_datetimes,
+            )
+
+    documents = list(iter_file(
+        file,
+        format=format,
+        pkg=pkg,
+        native_datetimes=native_datetimes,
+        compression=compression,
+    ))
+
+    if format == 'jsonl':
+        return documents
+    if len(documents) != 1:
+        raise ValueError(
+            'Expected a single document, found %s' % (len(documents),)
+        )
+    return documents[0]
+
+
+def dump_file(
+        value,
+        file,
+        format=None,  # noqa: redefined-builtin
+        pretty=False,
+        pkg=None,
+        compression=None):
+    """
+    Writes a value to a (possibly compressed) file, compressing it
+    incrementally as it is serialized.
+
+    :param value:
+        the value to serialize; for JSON Lines, an iterable of the documents
+        to write; for JSON, lists, tuples and iterators are written in chunks
+        rather than serialized all at once (unless ``pretty`` is specified)
+    :param file:
+        the path to the file, or a file-like object open in binary mode
+    :param format:
+        the format to write (``json``, ``jsonl``, ``yaml``, or ``toml``); if
+        not specified, it is determined by the extension of the file name
+        (ignoring any compression extension)
+    :type format: str
+    :param pretty:
+        whether or not to format the output in a more human-readable way; if
+        not specified, defaults to ``False``
+    :type pretty: bool
+    :param pkg:
+        the package to use for serialization; if not specified, uses the first
+        supported package found in the environment
+    :type pkg: str
+    :param compression:
+        the compression to use (``gzip``, ``bz2``, or ``xz``), or ``False``
+        for none; if not specified, it is chosen by the extension of the file
+        name
+    :type compression: str
+    """
+
+    format = _get_format(file, format)
+    _check_compression(compression)
+
+    with _Opened(file, 'wb', compression) as stream:
+        if format == 'json':
+            # Only plain sequences are streamed; subclasses such as
+            # namedtuples aren't written as arrays.
+            if not pretty and (
+                    type(value) in (list, tuple)
+                    or isinstance(value, Iterator)):
+                for chunk in iter_to_json(value, pkg=pkg):
+                    stream.write(chunk)
+            else:
+                stream.write(
+                    to_json(value, pretty=pretty, pkg=pkg).encode('utf-8')
+                )
+
+        elif format == 'jsonl':
+            for document in value:
+                stream.write(to_json(document, pkg=pkg).encode('utf-8'))
+                stream.write(b'\n')
+
+        elif format == 'yaml':
+            stream.write(
+                to_yaml(value, pretty=pretty, pkg=pkg).encode('utf-8')
+            )
+
+        else:
+            stream.write(
+                to_toml(value, pretty=pretty, pkg=pkg).encode('utf-8')
+            )
@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+import hashlib
+import json
+
+from operator import itemgetter
+
+from .json import _make_json_friendly
+
+
+FORMATS = ('json',)
+
+# The number of characters of output gathered before they are fed to the
+# hash.
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+# The most values (counting those in nested containers) that are encoded at a
+# time.
+BATCH_SIZE = 1000
+
+# Sorted keys, no whitespace, and no escaping of non-ASCII characters, so
+# that equivalent values always produce the same text.
+_ENCODER = json.JSONEncoder(
+    ensure_ascii=False,
+    sort_keys=True,
+    separators=(',', ':'),
+)
+
+_CONTAINER_TYPES = frozenset((dict, list))
+
+_STRING_TYPES = frozenset((str,))
+
+
+class _Encoded(str):
+    """
+    Text that has already been encoded.
+    """
+
+
+def _measure(value):
+    # The number of values in the container (counting itself), if it is small
+    # enough to be encoded in one go and only has string keys (which the
+    # encoder can sort by itself); otherwise, -1.
+    budget = BATCH_SIZE
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        budget -= len(value) + 1
+        if budget < 0:
+            return -1
+        if type(value) is dict:
+            if not _STRING_TYPES.issuperset(map(type, value)):
+                return -1
+            value = value.values()
+        if not _CONTAINER_TYPES.isdisjoint(map(type, value)):
+            pending.extend(
+                member
+                for member in value
+                if type(member) in _CONTAINER_TYPES
+            )
+    return BATCH_SIZE - budget
+
+
+def _key_to_str(key):
+    if isinstance(key, str):
+        return key
+    key = _make_json_friendly(key)
+    if isinstance(key, str):
+        return key
+    # Numbers, booleans and None, as JSON writes them when used as keys.
+    return _ENCODER.encode(key)
+
+
+def _get_items(mapping):
+    if _STRING_TYPES.issuperset(map(type, mapping)):
+        items = list(mapping.items())
+        items.sort(key=itemgetter(0))
+        return items
+
+    items = [(_key_to_str(key), value) for key, value in mapping.items()]
+    items.sort(key=itemgetter(0))
+    # Different keys can be written the same way (e.g. a date and the string
+    # of it), which would leave two values with no way to tell them apart.
+    for (key, _), (next_key, _) in zip(items, items[1:]):
+        if key == next_key:
+            raise ValueError('Duplicate key "%s" in mapping' % (key,))
+    return items
+
+
+def _iter_members(values, encode_range, get_label):
+    # Yields (text before the member, member) pairs for the members of a
+    # container, with runs of small members encoded together.
+    if _CONTAINER_TYPES.isdisjoint(map(type, values)):
+        for start in range(0, len(values), BATCH_SIZE):
+            yield (
+                ',' if start else '',
+                _Encoded(encode_range(start, start + BATCH_SIZE)),
+            )
+        return
+
+    start, room, separator = 0, BATCH_SIZE, ''
+    for pos, value in enumerate(values):
+        size = _measure(value) if type(value) in _CONTAINER_TYPES else 1
+
+        if pos > start and (size < 0 or size > room):
+            yield separator, _Encoded(encode_range(start, pos))
+            start, room, separator = pos, BATCH_SIZE, ','
+
+        if size < 0:
+            yield separator + get_label(pos), value
+            start, separator = pos + 1, ','
+        else:
+            room -= size
+
+    if len(values) > start:
+        yield separator, _Encoded(encode_range(start, len(values)))
+
+
+def _iter_list(values, encode):
+    def encode_range(start, end):
+        return encode(values[start:end])[1:-1]
+
+    return _iter_members(values, encode_range, lambda pos: '')
+
+
+def _iter_dict(mapping, encode):
+    items = _get_items(mapping)
+    keys = [key for key, _ in items]
+    values = [value for _, value in items]
+
+    def encode_range(start, end):
+        return encode(dict(zip(keys[start:end], values[start:end])))[1:-1]
+
+    def get_label(pos):
+        return encode(keys[pos]) + ':'
+
+    return _iter_members(values, encode_range, get_label)
+
+
+def _iter_pieces(value):
+    encode = _ENCODER.encode
+    if type(value) not in _CONTAINER_TYPES or _measure(value) >= 0:
+        yield encode(value)
+        return
+
+    # Each entry is an iterator over the members of a container being
+    # written, along with the text that closes the container.
+    stack = [(iter((('', value),)), '')]
+    while stack:
+        members, closer = stack[-1]
+        for prefix, member in members:
+            if type(member) is _Encoded:
+                yield prefix
+                yield member
+            elif type(member) is list:
+                yield prefix + '['
+                stack.append((_iter_list(member, encode), ']'))
+                break
+            else:
+                yield prefix + '{'
+                stack.append((_iter_dict(member, encode), '}'))
+                break
+
+        else:
+            stack.pop()
+            yield closer
+
+
+def fingerprint(
+        value,
+        algorithm='sha256',
+        format='json'):  # noqa: redefined-builtin
+    """
+    Calculates a hash of the given value that is suitable for use as an ETag
+    or a cache key. The value is written out in a canonical form (with the
+    keys of mappings sorted and no whitespace), which is fed to the hash a
+    piece at a time rather than being built up as one string, so equivalent
+    values (e.g. a ``dict`` and an ``OrderedDict`` with the same contents)
+    always produce the same hash.
+
+    :param value: the value to hash
+    :param algorithm:
+        the name of the hash algorithm to use, as accepted by
+        ``hashlib.new()``; if not specified, defaults to ``sha256``
+    :type algorithm: str
+    :param format:
+        the format whose conversions (e.g., of dates/times to strings) are
+        applied to the value before it is hashed; only ``json`` is currently
+        supported, in which case the hash is that of the UTF-8 encoded JSON
+        with sorted keys and no whitespace
+    :type format: str
+    :returns: the hexadecimal digest of the hash
+    :rtype: str
+    :raises ValueError:
+        if a mapping has keys that are written the same way, such as a date
+        and the string of it
+    """
+
+    if format not in FORMATS:
+        raise ValueError('"%s" is not a supported format' % (format,))
+
+    digest = hashlib.new(algorithm)
+    buffered, size = [], 0
+    for piece in _iter_pieces(_make_json_friendly(value)):
+        buffered.append(piece)
+        size += len(piece)
+        if size >= FINGERPRINT_CHUNK_SIZE:
+            digest.update(''.join(buffered).encode('utf-8'))
+            buffered, size = [], 0
+    digest.update(''.join(buffered).encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,275 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left
+
+from .json import IMPLEMENTATIONS
+from .util import convert_decoded
+
+
+INDEX_MAGIC = b'BSJLIDX1'
+
+# magic, byte order, source size, source mtime, records, keys, key length
+INDEX_HEADER = struct.Struct('<8sBQqQQI')
+
+INDEX_BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+
+WHITESPACE = frozenset(b' \t\r\n')
+
+
+def _hash_key(value):
+    digest = hashlib.blake2b(
+        repr(value).encode('utf-8'),
+        digest_size=8,
+    ).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _read_array(handle, count):
+    values = array('Q')
+    if count:
+        values.fromfile(handle, count)
+    return values
+
+
+class JsonlIndex:
+    """
+    Random access to the records of a JSON Lines file, without reading the
+    whole file. The position of each record (and, optionally, a hash of one
+    of its fields) is gathered in a single pass over the file and saved to a
+    sidecar file, so later uses of the same file can skip that pass. Records
+    are then read straight out of a memory map of the file, and only the
+    records asked for are decoded.
+
+    :param path: the path to the JSON Lines file
+    :type path: str
+    :param key:
+        the name of a field in each record to index, so records can be found
+        by its value with ``lookup()``; if not specified, records can only
+        be retrieved by position
+    :type key: str
+    :param pkg:
+        the JSON package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param index_path:
+        the path of the sidecar file to store the index in; if ``False``, the
+        index is not saved; if not specified, defaults to the path of the
+        JSON Lines file with ``.idx`` appended
+    :type index_path: str
+    """
+
+    def __init__(
+            self,
+            path,
+            key=None,
+            pkg=None,
+            native_datetimes=True,
+            index_path=None):
+        self.path = os.fspath(path)
+        self.key = key
+        self._impl = IMPLEMENTATIONS.get(pkg)
+        self._native_datetimes = native_datetimes
+        if index_path is None:
+            index_path = self.path + '.idx'
+        self.index_path = index_path
+
+        with open(self.path, 'rb') as handle:
+            stat = os.fstat(handle.fileno())
+            self._signature = (stat.st_size, stat.st_mtime_ns)
+            if stat.st_size:
+                self._buffer = mmap.mmap(
+                    handle.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+            else:
+                self._buffer = b''
+
+        if not self._load_index():
+            self._build_index()
+            self._save_index()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory map of the file.
+        """
+
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def get(self, number):
+        """
+        Retrieves a record by its position in the file (ignoring blank
+        lines).
+
+        :param number: the position of the record; negative numbers count
+            back from the end
+        :type number: int
+        :raises IndexError: if there is no record at that position
+        """
+
+        if number < 0:
+            number += len(self._offsets)
+        if not 0 <= number < len(self._offsets):
+            raise IndexError('Record %s does not exist' % (number,))
+        return self._impl.deserialize(
+            self._get_line(number),
+            native_datetimes=self._native_datetimes,
+        )
+
+    def lookup(self, key):
+        """
+        Retrieves the first record whose indexed field has the given value.
+
+        :param key: the value of the field
+        :raises KeyError: if no record has that value
+        :raises ValueError: if the index was created without a ``key``
+        """
+
+        if self.key is None:
+            raise ValueError('This index was created without a key')
+
+        hashed = _hash_key(key)
+        pos = bisect_left(self._key_hashes, hashed)
+        while pos < len(self._key_hashes) \
+                and self._key_hashes[pos] == hashed:
+            record = self._impl.deserialize(
+                self._get_line(self._key_lines[pos]),
+                native_datetimes=False,
+            )
+            found = record[self.key]
+            if found == key and type(found) is type(key):
+                if self._native_datetimes:
+                    return convert_decoded(record)
+                return record
+            pos += 1
+
+        raise KeyError(key)
+
+    def _get_line(self, number):
+        start = self._offsets[number]
+        end = self._buffer.find(b'\n', start)
+        if end < 0:
+            end = len(self._buffer)
+        return self._buffer[start:end]
+
+    def _build_index(self):
+        buf = self._buffer
+        size = len(buf)
+        key = self.key
+        deserialize = self._impl.deserialize
+        self._offsets = offsets = array('Q')
+        hashes = array('Q')
+
+        start = 0
+        while start < size:
+            end = buf.find(b'\n', start)
+            if end < 0:
+                end = size
+            # Only look closer at lines that start with whitespace, as they
+            # might be blank.
+            if end > start \
+                    and (buf[start] not in WHITESPACE
+                         or buf[start:end].strip()):
+                offsets.append(start)
+                if key is not None:
+                    record = deserialize(
+                        buf[start:end],
+                        native_datetimes=False,
+                    )
+                    if isinstance(record, dict) and key in record:
+                        hashes.append(_hash_key(record[key]))
+                    else:
+                        hashes.append(0)
+            start = end + 1
+
+        # Sort the hashes (keeping the records with the same hash in file
+        # order), dropping the records that don't have the field.
+        order = sorted(
+            (number for number, hashed in enumerate(hashes) if hashed),
+            key=hashes.__getitem__,
+        )
+        self._key_hashes = array('Q', [hashes[number] for number in order])
+        self._key_lines = array('Q', order)
+
+    def _get_header(self):
+        key = (self.key or '').encode('utf-8')
+        return INDEX_HEADER.pack(
+            INDEX_MAGIC,
+            INDEX_BYTE_ORDER,
+            self._signature[0],
+            self._signature[1],
+            len(self._offsets),
+            len(self._key_hashes),
+            len(key),
+        ) + key
+
+    def _load_index(self):
+        if not self.index_path:
+            return False
+
+        try:
+            with open(self.index_path, 'rb') as handle:
+                header = handle.read(INDEX_HEADER.size)
+                if len(header) != INDEX_HEADER.size:
+                    return False
+                magic, byte_order, size, mtime, records, keys, key_length = \
+                    INDEX_HEADER.unpack(header)
+                key = handle.read(key_length).decode('utf-8')
+                if (magic, byte_order, size, mtime, key) != (
+                        INDEX_MAGIC,
+                        INDEX_BYTE_ORDER,
+                        self._signature[0],
+                        self._signature[1],
+                        self.key or ''):
+                    return False
+
+                self._offsets = _read_array(handle, records)
+                self._key_hashes = _read_array(handle, keys)
+                self._key_lines = _read_array(handle, keys)
+        except (OSError, EOFError, UnicodeDecodeError):
+            return False
+
+        return True
+
+    def _save_index(self):
+        if not self.index_path:
+            return
+
+        temp_path = '%s.%d.tmp' % (self.index_path, os.getpid())
+        try:
+            with open(temp_path, 'wb') as handle:
+                handle.write(self._get_header())
+                self._offsets.tofile(handle)
+                self._key_hashes.tofile(handle)
+                self._key_lines.tofile(handle)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # The sidecar is only a cache, so carry on without it.
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
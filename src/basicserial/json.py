@@ -2,24 +2,33 @@
 # Copyright (c) 2018, Jason Simeone
 #
 
+import codecs
 import datetime
 import decimal
 import fractions
-import enum
+import json
+import mmap
+import os
+import re
 import uuid
 
-from collections import (
-    UserDict,
-    UserList,
-    UserString,
-    OrderedDict,
-)
+from collections import UserString
+from itertools import islice
 
 from .util import (
-    get_date_or_string,
-    convert_datetimes,
+    apply_encoder,
+    build_decoder,
+    check_encoder,
+    convert_decoded,
     Implementation,
     ImplementationRegistry,
+    InternTable,
+    Limits,
+    Normalizer,
+    is_plain_numpy,
+    numpy_to_python,
+    recursion_guard,
+    to_columns,
 )
 
 
@@ -43,53 +52,87 @@ ENCODINGS = (
     (uuid.UUID, str),
 )
 
+JSON_NATIVE_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_native_numpy(value):
+    # The subset of arrays that orjson can serialize by itself.
+    kind = value.dtype.kind
+    return value.ndim > 0 \
+        and value.flags.c_contiguous \
+        and (kind in 'biu' or (kind == 'f' and value.dtype.itemsize in (4, 8)))
 
-def _make_json_friendly(value):
-    if isinstance(value, tuple) and hasattr(value, '_fields'):
-        return _make_json_friendly(value._asdict())
 
-    if isinstance(value, (dict, UserDict)):
-        return OrderedDict([
-            (key, _make_json_friendly(value[key]))
-            for key in value
-        ])
+def _encode_numpy(value):
+    if _is_native_numpy(value):
+        return value, True
+    return numpy_to_python(value), is_plain_numpy(value)
 
-    if isinstance(value, (list, set, frozenset, tuple, UserList)):
-        return [
-            _make_json_friendly(element)
-            for element in value
-        ]
 
-    if isinstance(value, enum.Enum):
-        return value.value
+# (native_numpy, decimals): Normalizer
+_NORMALIZERS = {
+    (False, False): Normalizer(JSON_NATIVE_TYPES, ENCODINGS),
+    (True, False): Normalizer(JSON_NATIVE_TYPES, ENCODINGS, _encode_numpy),
+    (False, True): Normalizer(
+        JSON_NATIVE_TYPES + (decimal.Decimal,),
+        ENCODINGS,
+    ),
+    (True, True): Normalizer(
+        JSON_NATIVE_TYPES + (decimal.Decimal,),
+        ENCODINGS,
+        _encode_numpy,
+    ),
+}
 
-    for typ, encoder in ENCODINGS:
-        if isinstance(value, typ):
-            return encoder(value)
 
-    return value
+def _make_json_friendly(value, native_numpy=False, memo=None, decimals=False):
+    return _NORMALIZERS[native_numpy, decimals](value, memo=memo)
 
 
 class JsonImplementation(Implementation):
-    def serialize(self, value, pretty=False):
+    native_numpy = False
+    native_decimals = False
+
+    def serialize(self, value, pretty=False, decimals=False):
         raise NotImplementedError
 
-    def deserialize(self, value, native_datetimes=True):
-        result = self._module.loads(value)
+    def deserialize(
+            self,
+            value,
+            native_datetimes=True,
+            interner=None,
+            frozen=False,
+            limits=None,
+            decimals=False):
+        if limits is not None:
+            limits.check_size(value)
+        if decimals:
+            result = self._load_decimals(value)
+        else:
+            result = self._module.loads(value)
+        if limits is not None:
+            limits.check_structure(result)
 
-        if native_datetimes:
-            if isinstance(result, (dict, list)):
-                result = convert_datetimes(result)
-            elif isinstance(result, str):
-                result = get_date_or_string(result)
+        if native_datetimes or interner is not None or frozen:
+            result = convert_decoded(
+                result,
+                native_datetimes=native_datetimes,
+                interner=interner,
+                frozen=frozen,
+            )
 
         return result
 
+    def _load_decimals(self, value):
+        # Packages that can't parse numbers into Decimals themselves fall back
+        # to the stdlib's hook.
+        return json.loads(value, parse_float=decimal.Decimal)
+
 
 class StdlibJsonImplementation(JsonImplementation):
     module_name = 'json'
 
-    def serialize(self, value, pretty=False):
+    def serialize(self, value, pretty=False, decimals=False):
         opts = {
             'sort_keys': False,
         }
@@ -101,38 +144,82 @@ class StdlibJsonImplementation(JsonImplementation):
 
 class SimpleJsonImplementation(StdlibJsonImplementation):
     module_name = 'simplejson'
+    native_decimals = True
+
+    def serialize(self, value, pretty=False, decimals=False):
+        opts = {
+            'sort_keys': False,
+            'use_decimal': decimals,
+        }
+        if pretty:
+            opts['indent'] = 2
+            opts['separators'] = (',', ': ')
+        return self._module.dumps(value, **opts)
+
+    def _load_decimals(self, value):
+        return self._module.loads(value, use_decimal=True)
 
 
 class OrJsonImplementation(JsonImplementation):
     module_name = 'orjson'
+    native_numpy = True
+
+    def __init__(self):
+        super().__init__()
+        # orjson can only write Decimals as raw fragments of JSON, which
+        # older versions don't support.
+        self.native_decimals = hasattr(self._module, 'Fragment')
 
-    def serialize(self, value, pretty=False):
-        opts = {}
+    def serialize(self, value, pretty=False, decimals=False):
+        option = self._module.OPT_SERIALIZE_NUMPY
         if pretty:
-            opts['option'] = self._module.OPT_INDENT_2
-        return self._module.dumps(value, **opts).decode('utf-8')
+            option |= self._module.OPT_INDENT_2
+        default = self._encode_decimal if decimals else None
+        return self._module.dumps(
+            value,
+            option=option,
+            default=default,
+        ).decode('utf-8')
+
+    def _encode_decimal(self, value):
+        if isinstance(value, decimal.Decimal):
+            return self._module.Fragment(str(value))
+        raise TypeError(
+            'Type is not JSON serializable: %s' % (type(value).__name__,)
+        )
 
 
 class RapidJsonImplementation(JsonImplementation):
     module_name = 'rapidjson'
+    native_decimals = True
 
-    def serialize(self, value, pretty=False):
+    def serialize(self, value, pretty=False, decimals=False):
         opts = {
             'sort_keys': False,
         }
         if pretty:
             opts['indent'] = 2
+        if decimals:
+            opts['number_mode'] = self._module.NM_DECIMAL
         return self._module.dumps(value, **opts)
 
+    def _load_decimals(self, value):
+        return self._module.loads(
+            value,
+            number_mode=self._module.NM_DECIMAL,
+        )
+
 
 class UJsonImplementation(RapidJsonImplementation):
     module_name = 'ujson'
+    native_decimals = False
+    _load_decimals = JsonImplementation._load_decimals
 
 
 class HyperJsonImplementation(JsonImplementation):
     module_name = 'hyperjson'
 
-    def serialize(self, value, pretty=False):
+    def serialize(self, value, pretty=False, decimals=False):
         opts = {
             'sort_keys': False,
         }
@@ -152,8 +239,55 @@ IMPLEMENTATIONS.register('ujson', UJsonImplementation)
 IMPLEMENTATIONS.register('hyperjson', HyperJsonImplementation)
 IMPLEMENTATIONS.register('simdjson', SimdJsonImplementation)
 
+# The packages to prefer when speed matters more than the user's choice.
+FAST_PACKAGES = (
+    'orjson',
+    'rapidjson',
+    'ujson',
+    'simdjson',
+    'json',
+)
+
+# The packages to prefer when writing Decimals exactly, if none was chosen.
+DECIMAL_PACKAGES = (
+    'rapidjson',
+    'orjson',
+    'simplejson',
+)
+
+
+def _get_decimal_implementation(pkg):
+    if pkg is None:
+        pkg = next(
+            (
+                package
+                for package in DECIMAL_PACKAGES
+                if package in IMPLEMENTATIONS.available_packages
+                and IMPLEMENTATIONS.get(package).native_decimals
+            ),
+            None,
+        )
+
+    impl = IMPLEMENTATIONS.get(pkg)
+    if not impl.native_decimals:
+        raise ValueError(
+            'The "%s" package cannot write Decimals exactly'
+            % (impl.module_name,)
+        )
+    return impl
+
 
-def to_json(value, pretty=False, pkg=None):
+@recursion_guard
+def to_json(
+        value,
+        pretty=False,
+        pkg=None,
+        encoder=None,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None,
+        memo=None,
+        decimals=False):
     """
     Serializes the given value to JSON.
 
@@ -166,17 +300,554 @@ def to_json(value, pretty=False, pkg=None):
         the JSON package to use for serialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param encoder:
+        a function generated by ``compile_encoder()`` to use to prepare the
+        value (or each element of the value, if it is a list or tuple) instead
+        of the generic conversion
+    :type encoder: function
+    :param max_bytes:
+        the maximum size of the output, in bytes; if not specified, there is
+        no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the value, checked before it is
+        serialized; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        in the value, checked before it is serialized; if not specified,
+        there is no limit
+    :type max_nodes: int
+    :param memo:
+        an ``EncodeMemo`` to reuse (and remember) the conversions of
+        immutable containers, such as tuples, across multiple calls
+    :type memo: EncodeMemo
+    :param decimals:
+        whether or not to write ``Decimal`` values exactly, rather than
+        converting them to floats first; requires a package that supports it
+        (``rapidjson``, ``simplejson``, or ``orjson`` 3.9 or later), and, if
+        ``pkg`` is not specified, uses the first of them found in the
+        environment; cannot be combined with ``encoder``; if not specified,
+        defaults to ``False``
+    :type decimals: bool
+    :raises LimitExceededError: if the value exceeds one of the limits
+    :raises ValueError: if the value contains itself
     :rtype: str
     """
 
+    if encoder is not None:
+        check_encoder(encoder, 'json')
+    if decimals:
+        if encoder is not None:
+            raise ValueError('decimals cannot be combined with an encoder')
+        impl = _get_decimal_implementation(pkg)
+    else:
+        impl = IMPLEMENTATIONS.get(pkg)
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if limits is not None:
+        limits.check_structure(value)
+
+    if encoder is not None:
+        value = apply_encoder(value, encoder)
+    else:
+        value = _make_json_friendly(
+            value,
+            native_numpy=impl.native_numpy,
+            memo=memo,
+            decimals=decimals,
+        )
+    result = impl.serialize(value, pretty=pretty, decimals=decimals)
+
+    if limits is not None:
+        limits.check_size(result)
+    return result
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_to_json(
+        iterable,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        pkg=None,
+        encoder=None,
+        memo=None):
+    """
+    Serializes the elements of the given iterable (such as a generator) to a
+    JSON array, a batch of elements at a time. The pieces joined together are
+    identical to the output of ``to_json(list(iterable))``, but only one batch
+    of elements is held in memory at a time.
+
+    :param iterable: the elements to serialize
+    :param chunk_size:
+        the number of elements to serialize at a time; if not specified,
+        defaults to 1000
+    :type chunk_size: int
+    :param pkg:
+        the JSON package to use for serialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param encoder:
+        a function generated by ``compile_encoder()`` to use to prepare each
+        element instead of the generic conversion
+    :type encoder: function
+    :param memo:
+        an ``EncodeMemo`` to reuse (and remember) the conversions of
+        immutable containers, such as tuples, across batches (and calls)
+    :type memo: EncodeMemo
+    :returns: the UTF-8 encoded pieces of the array
+    :rtype: generator of bytes
+    """
+
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    if encoder is not None:
+        check_encoder(encoder, 'json')
+
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.serialize(_make_json_friendly(value), pretty=pretty)
+
+    # Use the same separator between batches as the package uses between
+    # elements.
+    separator = impl.serialize([0, 0])[2:-2].encode('utf-8')
+
+    iterator = iter(iterable)
+    prefix = b'['
+    while True:
+        batch = list(islice(iterator, chunk_size))
+        if not batch:
+            break
+        if encoder is not None:
+            batch = apply_encoder(batch, encoder)
+        else:
+            batch = _make_json_friendly(
+                batch,
+                native_numpy=impl.native_numpy,
+                memo=memo,
+            )
+        encoded = impl.serialize(batch).encode('utf-8')
+        yield prefix + encoded[1:-1]
+        prefix = separator
+
+    yield b']' if prefix is separator else b'[]'
+
+
+def _get_interner(intern_strings):
+    if intern_strings is True:
+        return InternTable()
+    if intern_strings is False:
+        return None
+    return intern_strings
+
+
+def _apply_layout(records, layout, native_datetimes, frozen):
+    if layout == 'columns':
+        return to_columns(
+            records,
+            native_datetimes=native_datetimes,
+            frozen=frozen,
+        )
+    return records
+
+
+def _check_layout(layout):
+    if layout not in ('records', 'columns'):
+        raise ValueError('"%s" is not a supported layout' % (layout,))
+    return layout == 'records'
+
+
+JSON_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+
+def _build_json_nesting(depth):
+    # Builds a pattern that matches the content of a container, with strings
+    # and brackets nested up to ``depth`` levels deep, without any
+    # catastrophic backtracking.
+    inner = rb'[^"\[\]{}]*(?:' + JSON_STRING + rb'[^"\[\]{}]*)*'
+    for _ in range(depth - 1):
+        inner = rb'[^"\[\]{}]*(?:(?:%s|\{%s\}|\[%s\])[^"\[\]{}]*)*' % (
+            JSON_STRING,
+            inner,
+            inner,
+        )
+    return inner
+
+
+# How deeply nested the elements of an array can be before falling back to
+# scanning them one structural character at a time.
+JSON_ELEMENT_DEPTH = 4
+JSON_NESTING = _build_json_nesting(JSON_ELEMENT_DEPTH)
+JSON_CONTAINER = rb'\{%s\}|\[%s\]' % (JSON_NESTING, JSON_NESTING)
+JSON_ELEMENT = rb'[^"\[\]{},]*(?:(?:%s|%s)[^"\[\]{},]*)*' % (
+    JSON_STRING,
+    JSON_CONTAINER,
+)
+
+# Matches as many whole array elements (and their trailing commas) as fit.
+RE_JSON_ELEMENTS = re.compile(rb'(?:%s,)*' % (JSON_ELEMENT,), re.DOTALL)
+
+# Matches one array element, and the comma or bracket that ends it.
+RE_JSON_ELEMENT = re.compile(rb'%s([,\]])' % (JSON_ELEMENT,), re.DOTALL)
+
+# Matches everything up to and including the next structural character that
+# is not inside a string.
+RE_JSON_STRUCTURAL = re.compile(
+    rb'[^"\[\]{},]*(?:' + JSON_STRING + rb'[^"\[\]{},]*)*([\[\]{},])',
+    re.DOTALL,
+)
+
+RE_JSON_ARRAY_START = re.compile(rb'\s*\[')
+RE_JSON_END = re.compile(rb'\s*\Z')
+
+JSON_OPENERS = frozenset(b'[{')
+JSON_CLOSERS = frozenset(b']}')
+
+# How many chunks to give each worker, so that uneven chunks even out.
+CHUNKS_PER_WORKER = 4
+
+
+def _skip_json_element(buf, pos):
+    # Finds the end of an array element that is too deeply nested for
+    # RE_JSON_ELEMENT, returning the position after the comma or bracket
+    # that ends it.
+    depth = 1
+    for match in RE_JSON_STRUCTURAL.finditer(buf, pos):
+        if match.start() != pos:
+            return None
+        pos = match.end()
+        char = buf[pos - 1]
+
+        if char in JSON_OPENERS:
+            depth += 1
+        elif char in JSON_CLOSERS:
+            depth -= 1
+            if not depth:
+                return pos
+        elif depth == 1:
+            return pos
+    return None
+
+
+def _iter_json_array(buf, count):
+    # Yields runs of whole elements of a top-level array, as (start, end)
+    # offsets of the text between the brackets, aiming for ``count`` runs.
+    # Raises a ValueError if the array turns out to be malformed.
+
+    pos = chunk_start = first = RE_JSON_ARRAY_START.match(buf).end()
+    chunk_size = max(1, (len(buf) - pos) // count)
+
+    while True:
+        # Skip over the elements that fit in this chunk, then take one more
+        # to reach the chunk's size.
+        pos = RE_JSON_ELEMENTS.match(
+            buf,
+            pos,
+            max(pos, chunk_start + chunk_size),
+        ).end()
+
+        match = RE_JSON_ELEMENT.match(buf, pos)
+        if match:
+            pos = match.end()
+        else:
+            pos = _skip_json_element(buf, pos)
+            if pos is None:
+                raise ValueError('Malformed JSON array')
+
+        closing = buf[pos - 1] in JSON_CLOSERS
+        if closing and not RE_JSON_END.match(buf, pos):
+            raise ValueError('Malformed JSON array')
+
+        # A run that is nothing but whitespace is an empty element (from a
+        # leading or trailing comma), which the workers would each read as
+        # an empty array, unless it is the whole of an empty array.
+        if RE_JSON_END.match(buf, chunk_start, pos - 1) \
+                and not (closing and chunk_start == first):
+            raise ValueError('Malformed JSON array')
+
+        yield chunk_start, pos - 1
+        if closing:
+            return
+        chunk_start = pos
+
+
+_WORKER_STATE = {}
+
+
+def _init_parallel_worker(source, pkg, native_datetimes, decimals):
+    if not isinstance(source, mmap.mmap):
+        with open(source, 'rb') as handle:
+            source = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    _WORKER_STATE['source'] = source
+    _WORKER_STATE['impl'] = IMPLEMENTATIONS.get(pkg)
+    _WORKER_STATE['native_datetimes'] = native_datetimes
+    _WORKER_STATE['decimals'] = decimals
 
 
-def from_json(value, native_datetimes=True, pkg=None):
+def _parse_parallel_chunk(start, end):
+    text = b'[' + _WORKER_STATE['source'][start:end] + b']'
+    return _WORKER_STATE['impl'].deserialize(
+        text.decode('utf-8'),
+        native_datetimes=_WORKER_STATE['native_datetimes'],
+        decimals=_WORKER_STATE['decimals'],
+    )
+
+
+def _open_source(value):
+    if isinstance(value, mmap.mmap):
+        return value
+    with open(value, 'rb') as handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_parallel_chunks(
+        value,
+        buf,
+        parallel,
+        pkg,
+        native_datetimes,
+        decimals):
+    # These are slow to import, and only needed here.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if isinstance(value, mmap.mmap):
+        # An mmap can't be sent to the workers, but forked workers inherit
+        # it, so nothing needs to be copied.
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError(
+                'Parallel decoding of an mmap requires the fork start method',
+            )
+        context = multiprocessing.get_context('fork')
+        source = value
+    else:
+        context = None
+        source = os.fspath(value)
+
+    with ProcessPoolExecutor(
+            max_workers=parallel,
+            mp_context=context,
+            initializer=_init_parallel_worker,
+            initargs=(source, pkg, native_datetimes, decimals)) as executor:
+        # The chunks are handed out as they're found, so the workers can get
+        # started while the rest of the array is scanned.
+        futures = []
+        try:
+            for start, end in _iter_json_array(
+                    buf,
+                    parallel * CHUNKS_PER_WORKER):
+                futures.append(executor.submit(
+                    _parse_parallel_chunk,
+                    start,
+                    end,
+                ))
+        except ValueError:
+            for future in futures:
+                future.cancel()
+            return None
+
+        result = []
+        for future in futures:
+            result.extend(future.result())
+        return result
+
+
+def _parse_parallel(
+        value,
+        parallel,
+        impl,
+        pkg,
+        native_datetimes,
+        limits,
+        decimals):
+    if not isinstance(value, (os.PathLike, mmap.mmap)):
+        raise ValueError(
+            'Parallel decoding requires a file; pass a pathlib.Path or mmap,'
+            ' not a %s' % (type(value).__name__,)
+        )
+    if parallel < 1:
+        raise ValueError('parallel must be at least 1')
+
+    buf = _open_source(value)
+    try:
+        if limits is not None:
+            limits.check_size(buf)
+
+        result = None
+        if parallel > 1 and RE_JSON_ARRAY_START.match(buf):
+            result = _parse_parallel_chunks(
+                value,
+                buf,
+                parallel,
+                pkg,
+                native_datetimes,
+                decimals,
+            )
+
+        if result is None:
+            # Not an array, or a malformed one; the package will report any
+            # syntax errors.
+            result = impl.deserialize(
+                buf[:].decode('utf-8'),
+                native_datetimes=native_datetimes,
+                decimals=decimals,
+            )
+        if limits is not None:
+            limits.check_structure(result)
+        return result
+    finally:
+        if buf is not value:
+            buf.close()
+
+
+@recursion_guard
+def from_json(
+        value,
+        native_datetimes=True,
+        pkg=None,
+        intern_strings=False,
+        frozen=False,
+        layout='records',
+        into=None,
+        parallel=None,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None,
+        decimals=False):
     """
     Deserializes the given value from JSON.
 
+    :param value:
+        the value to deserialize; when using ``parallel``, an ``os.PathLike``
+        (such as a ``pathlib.Path``) of a file containing the value, or an
+        ``mmap`` of one, as a plain ``str`` is always treated as JSON text
+    :type value: str, os.PathLike or mmap.mmap
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param pkg:
+        the JSON package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param intern_strings:
+        whether or not object keys and short string values should share a
+        single copy of each distinct string, which greatly reduces the memory
+        used by large arrays of similar records; may also be an
+        ``InternTable`` to share across multiple calls; if not specified,
+        defaults to ``False``
+    :type intern_strings: bool or InternTable
+    :param frozen:
+        whether or not to return immutable containers (tuples instead of
+        lists, and read-only mappings instead of dicts), so that the result
+        can be safely shared and cached; if not specified, defaults to
+        ``False``
+    :type frozen: bool
+    :param layout:
+        ``records`` to return the structure as it appears in the document, or
+        ``columns`` to pivot an array of objects into a dict of column names to
+        sequences of values (numeric columns are returned as ``array.array``
+        objects, or NumPy arrays if NumPy is installed); if not specified,
+        defaults to ``records``
+    :type layout: str
+    :param into:
+        the type to decode the value into, such as a dataclass or
+        ``List[SomeDataclass]``; values are only converted to dates/times
+        where the type calls for them, so ``native_datetimes`` is ignored
+    :type into: type
+    :param parallel:
+        the number of processes to use to decode a top-level array; the array
+        is split into runs of elements that are decoded (including casting
+        dates/times) in separate processes, and joined back together in order;
+        requires ``value`` to be an ``os.PathLike`` or an ``mmap``; if not
+        specified, the value is decoded in the current process
+    :type parallel: int
+    :param max_bytes:
+        the maximum size of the value, in bytes; checked before it is parsed;
+        if not specified, there is no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the decoded value; checked before any
+        dates/times are cast; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        in the decoded value; checked before any dates/times are cast; if not
+        specified, there is no limit
+    :type max_nodes: int
+    :param decimals:
+        whether or not to decode numbers with a fraction or an exponent as
+        ``Decimal`` values, keeping their exact value, rather than as floats;
+        uses the package's own support for this where it has it
+        (``rapidjson`` and ``simplejson``), and otherwise has Python's
+        built-in ``json`` module do the parsing; if not specified, defaults
+        to ``False``
+    :type decimals: bool
+    :raises LimitExceededError: if the value exceeds one of the limits
+    """
+
+    as_records = _check_layout(layout)
+    if into is not None:
+        if not as_records:
+            raise ValueError('Typed decoding requires the records layout')
+        native_datetimes = frozen = False
+
+    impl = IMPLEMENTATIONS.get(pkg)
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if parallel is not None:
+        result = _parse_parallel(
+            value,
+            parallel,
+            impl,
+            pkg,
+            native_datetimes and as_records,
+            limits,
+            decimals,
+        )
+        interner = _get_interner(intern_strings)
+        if interner is not None or (frozen and as_records):
+            result = convert_decoded(
+                result,
+                native_datetimes=False,
+                interner=interner,
+                frozen=frozen and as_records,
+            )
+    else:
+        result = impl.deserialize(
+            value,
+            native_datetimes=native_datetimes and as_records,
+            interner=_get_interner(intern_strings),
+            frozen=frozen and as_records,
+            limits=limits,
+            decimals=decimals,
+        )
+    if into is not None:
+        return build_decoder(into)(result)
+    return _apply_layout(result, layout, native_datetimes, frozen)
+
+
+@recursion_guard
+def from_jsonl(
+        value,
+        native_datetimes=True,
+        pkg=None,
+        intern_strings=False,
+        frozen=False,
+        layout='records',
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None):
+    """
+    Deserializes the given value from JSON Lines (one JSON document per line).
+
     :param value: the value to deserialize
     :type value: str
     :param native_datetimes:
@@ -188,7 +859,280 @@ def from_json(value, native_datetimes=True, pkg=None):
         the JSON package to use for deserialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param intern_strings:
+        whether or not object keys and short string values should share a
+        single copy of each distinct string; may also be an ``InternTable``
+        to share across multiple calls; if not specified, defaults to
+        ``False``
+    :type intern_strings: bool or InternTable
+    :param frozen:
+        whether or not to return immutable containers; if not specified,
+        defaults to ``False``
+    :type frozen: bool
+    :param layout:
+        ``records`` to return a list of the documents, or ``columns`` to pivot
+        them into a dict of column names to sequences of values; if not
+        specified, defaults to ``records``
+    :type layout: str
+    :param max_bytes:
+        the maximum size of the value, in bytes; checked before it is parsed;
+        if not specified, there is no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of each document; if not specified, there
+        is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        across all of the documents; if not specified, there is no limit
+    :type max_nodes: int
+    :raises LimitExceededError: if the value exceeds one of the limits
+    :rtype: list
     """
 
+    as_records = _check_layout(layout)
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.deserialize(value, native_datetimes=native_datetimes)
+    interner = _get_interner(intern_strings)
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if limits is not None:
+        limits.check_size(value)
+    records = [
+        impl.deserialize(
+            line,
+            native_datetimes=native_datetimes and as_records,
+            interner=interner,
+            frozen=frozen and as_records,
+            limits=limits,
+        )
+        for line in value.splitlines()
+        if line.strip()
+    ]
+    if frozen and as_records:
+        records = tuple(records)
+    return _apply_layout(records, layout, native_datetimes, frozen)
+
+
+RE_FEED_WHITESPACE = re.compile(r'[ \t\r\n]*')
+RE_FEED_SCALAR = re.compile(r'[^ \t\r\n\[\]{},"]*')
+RE_FEED_STRING = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*(")?', re.DOTALL)
+RE_FEED_CONTAINER = re.compile(r'[^"\[\]{}]*')
+RE_FEED_CONTAINER_VALUE = re.compile(
+    JSON_CONTAINER.decode('ascii'),
+    re.DOTALL,
+)
+
+FEED_VALUES = 'values'
+FEED_ARRAY_START = 'array_start'
+FEED_ARRAY_FIRST = 'array_first'
+FEED_ARRAY_ELEMENT = 'array_element'
+FEED_ARRAY_SEPARATOR = 'array_separator'
+FEED_ARRAY_DONE = 'array_done'
+
+
+class JsonFeedParser:
+    """
+    An incremental parser for JSON that arrives in pieces (such as from a
+    socket or a pipe). Each value is decoded as soon as all of its text has
+    been fed in, so only the text of the value currently being received is
+    buffered.
+
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param pkg:
+        the JSON package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param array_items:
+        whether the input is a single top-level array whose elements should
+        be returned one at a time, rather than a series of top-level values
+        (such as concatenated JSON or JSON Lines); if not specified, defaults
+        to ``False``
+    :type array_items: bool
+    """
+
+    def __init__(self, native_datetimes=True, pkg=None, array_items=False):
+        self._impl = IMPLEMENTATIONS.get(pkg)
+        self._native_datetimes = native_datetimes
+        self._decoder = None
+        self._buffer = ''
+        self._pos = 0
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._state = FEED_ARRAY_START if array_items else FEED_VALUES
+
+    def feed(self, chunk):
+        """
+        Adds more text to the parser.
+
+        :param chunk: the next piece of the input
+        :type chunk: str or bytes
+        :returns: the values that were completed by this piece
+        :rtype: list
+        """
+
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = self._decoder.decode(chunk)
+
+        self._buffer += chunk
+        return self._scan()
+
+    def close(self):
+        """
+        Signals the end of the input.
+
+        :returns: the values that could only be completed by the end of input
+        :rtype: list
+        :raises ValueError: if the input ended in the middle of a value
+        """
+
+        if self._decoder is not None:
+            self._buffer += self._decoder.decode(b'', final=True)
+        values = self._scan()
+
+        if self._start is not None and not self._depth \
+                and not self._in_string:
+            # A number or literal that ran up to the end of the input.
+            spans = []
+            self._complete(spans, len(self._buffer))
+            values.extend(self._decode(self._buffer, spans))
+            self._buffer = ''
+            self._pos = 0
+
+        if self._start is not None:
+            raise ValueError('Incomplete JSON value')
+        if self._state not in (FEED_VALUES, FEED_ARRAY_DONE):
+            raise ValueError('Incomplete JSON array')
+        return values
+
+    def _complete(self, spans, pos):
+        spans.append((self._start, pos))
+        self._start = None
+        if self._state != FEED_VALUES:
+            self._state = FEED_ARRAY_SEPARATOR
+
+    def _decode(self, buf, spans):
+        if not spans:
+            return []
+        if len(spans) == 1:
+            text = buf[spans[0][0]:spans[0][1]]
+        elif self._state == FEED_VALUES:
+            text = '[%s]' % (
+                ','.join([buf[start:end] for start, end in spans]),
+            )
+        else:
+            # The elements of an array are only separated by commas, so they
+            # can all be decoded at once.
+            text = '[%s]' % (buf[spans[0][0]:spans[-1][1]],)
+
+        values = self._impl.deserialize(
+            text,
+            native_datetimes=self._native_datetimes,
+        )
+        return [values] if len(spans) == 1 else values
+
+    def _scan_between(self, buf, pos, spans):  # noqa: complex
+        # Handles the text between values, returning the new position.
+        char = buf[pos]
+        state = self._state
+
+        if state == FEED_ARRAY_START:
+            if char != '[':
+                raise ValueError('Expected a JSON array')
+            self._state = FEED_ARRAY_FIRST
+            return pos + 1
+
+        if state == FEED_ARRAY_DONE:
+            raise ValueError('Extra data after JSON array')
+
+        if state == FEED_ARRAY_SEPARATOR:
+            if char == ',':
+                self._state = FEED_ARRAY_ELEMENT
+            elif char == ']':
+                self._state = FEED_ARRAY_DONE
+            else:
+                raise ValueError('Expected "," or "]" in JSON array')
+            return pos + 1
+
+        if char == ']' and state == FEED_ARRAY_FIRST:
+            self._state = FEED_ARRAY_DONE
+            return pos + 1
+
+        if char in ',]}':
+            raise ValueError('Unexpected "%s" in JSON' % (char,))
+
+        self._start = pos
+        if char in '[{':
+            # Most values will have arrived in full, and can be skipped over
+            # in one go.
+            match = RE_FEED_CONTAINER_VALUE.match(buf, pos)
+            if match:
+                self._complete(spans, match.end())
+                return match.end()
+            self._depth = 1
+            return pos + 1
+        if char == '"':
+            self._in_string = True
+            return pos + 1
+        return pos
+
+    def _scan(self):  # noqa: complex
+        buf = self._buffer
+        pos = self._pos
+        end = len(buf)
+        spans = []
+
+        while pos < end:
+            if self._start is None:
+                pos = RE_FEED_WHITESPACE.match(buf, pos).end()
+                if pos < end:
+                    pos = self._scan_between(buf, pos, spans)
+
+            elif self._in_string:
+                match = RE_FEED_STRING.match(buf, pos)
+                pos = match.end()
+                if not match.group(1):
+                    break
+                self._in_string = False
+                if not self._depth:
+                    self._complete(spans, pos)
+
+            elif not self._depth:
+                pos = RE_FEED_SCALAR.match(buf, pos).end()
+                if pos == end:
+                    break
+                self._complete(spans, pos)
+
+            else:
+                pos = RE_FEED_CONTAINER.match(buf, pos).end()
+                if pos == end:
+                    break
+                char = buf[pos]
+                pos += 1
+                if char == '"':
+                    self._in_string = True
+                elif char in '[{':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if not self._depth:
+                        self._complete(spans, pos)
+
+        values = self._decode(buf, spans)
+
+        # Only keep the text of the value that is still being received.
+        keep = pos if self._start is None else self._start
+        self._buffer = buf[keep:]
+        self._pos = pos - keep
+        if self._start is not None:
+            self._start -= keep
+        return values
@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+import datetime
+import decimal
+import gc
+
+from .json import (
+    IMPLEMENTATIONS as JSON_IMPLEMENTATIONS,
+    to_json,
+    from_json,
+    from_jsonl,
+)
+from .toml import (
+    IMPLEMENTATIONS as TOML_IMPLEMENTATIONS,
+    to_toml,
+    from_toml,
+)
+from .yaml import (
+    IMPLEMENTATIONS as YAML_IMPLEMENTATIONS,
+    to_yaml,
+    from_yaml,
+    from_yaml_all,
+)
+
+
+_SAMPLE_DATE = datetime.date(2018, 5, 22)
+_SAMPLE_DATETIME = datetime.datetime(
+    2018, 5, 22, 12, 34, 56,
+    tzinfo=datetime.timezone.utc,
+)
+
+# Small documents holding the common types of each format, so that the type
+# dispatch and date/time parsing are set up for them as well.
+_TOML_SAMPLE = {
+    'string': 'foo',
+    'integer': 1,
+    'float': 1.5,
+    'boolean': True,
+    'date': _SAMPLE_DATE,
+    'datetime': _SAMPLE_DATETIME,
+    'array': [1, 2],
+    'table': {'key': 'value'},
+}
+
+_SAMPLE = dict(
+    _TOML_SAMPLE,
+    null=None,
+    time=datetime.time(12, 34, 56),
+    decimal=decimal.Decimal('1.5'),
+    tuple=('foo', 1),
+    nested={'key': [{'key': None}]},
+)
+
+
+def _warm_json(pkg):
+    for pretty in (False, True):
+        encoded = to_json(_SAMPLE, pretty=pretty, pkg=pkg)
+    for native_datetimes in (True, False):
+        from_json(encoded, native_datetimes=native_datetimes, pkg=pkg)
+        from_jsonl(
+            to_json(_SAMPLE, pkg=pkg) + '\n',
+            native_datetimes=native_datetimes,
+            pkg=pkg,
+        )
+
+
+def _warm_yaml(pkg):
+    for pretty in (False, True):
+        encoded = to_yaml(_SAMPLE, pretty=pretty, pkg=pkg)
+    for native_datetimes in (True, False):
+        from_yaml(encoded, native_datetimes=native_datetimes, pkg=pkg)
+        from_yaml_all(
+            encoded + '\n---\n' + encoded,
+            native_datetimes=native_datetimes,
+            pkg=pkg,
+        )
+
+
+def _warm_toml(pkg):
+    encoded = to_toml(_TOML_SAMPLE, pkg=pkg)
+    for native_datetimes in (True, False):
+        from_toml(encoded, native_datetimes=native_datetimes, pkg=pkg)
+
+
+# format: (implementations, warmer)
+FORMATS = {
+    'json': (JSON_IMPLEMENTATIONS, _warm_json),
+    'yaml': (YAML_IMPLEMENTATIONS, _warm_yaml),
+    'toml': (TOML_IMPLEMENTATIONS, _warm_toml),
+}
+
+
+def warmup(formats=None, pkgs=None, freeze_gc=False):
+    """
+    Does the one-time setup of the serialization packages in advance, by
+    running a small document through each of them, so that it isn't paid for
+    by the first call that uses them. This is meant to be called in a parent
+    process before it forks its workers, so that they all start out with the
+    setup already done, and share the memory that holds it.
+
+    :param formats:
+        the formats to set up (``json``, ``yaml``, or ``toml``); if not
+        specified, all of them are
+    :type formats: list(str)
+    :param pkgs:
+        the packages to set up; if not specified, all of the available
+        packages for the chosen formats are
+    :type pkgs: list(str)
+    :param freeze_gc:
+        whether or not to call ``gc.freeze()`` afterward, moving everything
+        the process has allocated so far out of the reach of the garbage
+        collector, so that collections in the workers don't write to (and so
+        copy) the memory shared with the parent; if not specified, defaults
+        to ``False``
+    :type freeze_gc: bool
+    :returns: the packages that were set up
+    :rtype: tuple(str)
+    """
+
+    formats = tuple(FORMATS) if formats is None else tuple(formats)
+    for format in formats:  # noqa: redefined-builtin
+        if format not in FORMATS:
+            raise ValueError('"%s" is not a supported format' % (format,))
+
+    if pkgs is not None:
+        pkgs = tuple(pkgs)
+        for pkg in pkgs:
+            if not any(
+                    pkg in FORMATS[format][0].registered_packages
+                    for format in formats):
+                raise ValueError('"%s" is not a supported package' % (pkg,))
+
+    warmed = []
+    for format in formats:  # noqa: redefined-builtin
+        implementations, warm = FORMATS[format]
+        if pkgs is None:
+            chosen = implementations.available_packages
+        else:
+            chosen = [
+                pkg
+                for pkg in pkgs
+                if pkg in implementations.registered_packages
+            ]
+
+        for pkg in chosen:
+            # Complains about packages that aren't installed.
+            implementations.get(pkg)
+            warm(pkg)
+            warmed.append(pkg)
+
+    if freeze_gc:
+        gc.freeze()
+
+    return tuple(warmed)
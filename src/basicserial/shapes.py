@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+import enum
+import fractions
+import uuid
+
+from collections import UserDict, UserList, UserString
+
+from .json import ENCODINGS, JSON_NATIVE_TYPES, _make_json_friendly
+
+
+CONTAINER_TYPES = (
+    dict,
+    UserDict,
+    list,
+    set,
+    frozenset,
+    tuple,
+    UserList,
+    enum.Enum,
+)
+
+
+def _get_json_field_encoder(typ):
+    if typ in JSON_NATIVE_TYPES:
+        return None
+
+    if not issubclass(typ, CONTAINER_TYPES):
+        for encoding, encoder in ENCODINGS:
+            if issubclass(typ, encoding):
+                return encoder
+
+    return _make_json_friendly
+
+
+def _get_yaml_field_encoder(typ):
+    if issubclass(typ, enum.Enum):
+        return lambda value: value.value
+    if issubclass(typ, UserString):
+        return lambda value: value.data
+    if issubclass(typ, (uuid.UUID, complex, fractions.Fraction)):
+        return str
+    return None
+
+
+FORMATS = {
+    'json': (_get_json_field_encoder, _make_json_friendly),
+    'yaml': (_get_yaml_field_encoder, lambda value: value),
+}
+
+
+def _get_shape(sample_or_schema):
+    if isinstance(sample_or_schema, tuple) \
+            and hasattr(sample_or_schema, '_fields'):
+        sample_or_schema = sample_or_schema._asdict()
+    if not isinstance(sample_or_schema, (dict, UserDict)):
+        raise ValueError('Records must be described by a dict')
+
+    return [
+        (key, value if isinstance(value, type) else type(value))
+        for key, value in sample_or_schema.items()
+    ]
+
+
+def compile_encoder(
+        sample_or_schema,
+        format='json'):  # noqa: redefined-builtin
+    """
+    Generates a function that prepares records of a single shape for
+    serialization, skipping the generic type dispatch that is otherwise
+    performed on every key and value. The resulting function can be passed
+    to ``to_json()`` or ``to_yaml()`` via their ``encoder`` argument.
+
+    Records that don't match the shape (different keys, or values of
+    different types) are still handled, but through the generic conversion.
+
+    :param sample_or_schema:
+        either a sample record, or a dict mapping each key to the exact type
+        of its value
+    :type sample_or_schema: dict
+    :param format:
+        the format that the records will be serialized to (``json`` or
+        ``yaml``); the encoder can only be used with that format; if not
+        specified, defaults to ``json``
+    :type format: str
+    :rtype: function
+    """
+
+    if format not in FORMATS:
+        raise ValueError('"%s" is not a supported format' % (format,))
+    get_field_encoder, fallback = FORMATS[format]
+
+    shape = _get_shape(sample_or_schema)
+    namespace = {'fallback': fallback}
+    fetches, checks, fields = [], [], []
+    for idx, (key, typ) in enumerate(shape):
+        namespace['k%d' % idx] = key
+        namespace['t%d' % idx] = typ
+        fetches.append('v%d = record[k%d]' % (idx, idx))
+        if typ is type(None):
+            checks.append('v%d is None' % (idx,))
+        else:
+            checks.append('type(v%d) is t%d' % (idx, idx))
+
+        encoder = get_field_encoder(typ)
+        if encoder is None:
+            fields.append('k%d: v%d' % (idx, idx))
+        else:
+            namespace['e%d' % idx] = encoder
+            fields.append('k%d: e%d(v%d)' % (idx, idx, idx))
+
+    source = [
+        'def encode(record):',
+        '    if type(record) is dict and len(record) == %d:' % (len(shape),),
+        '        try:',
+    ]
+    source += ['            %s' % (fetch,) for fetch in fetches or ['pass']]
+    source += [
+        '        except KeyError:',
+        '            return fallback(record)',
+        '        if %s:' % (' and '.join(checks or ['True']),),
+        '            return {%s}' % (', '.join(fields),),
+        '    return fallback(record)',
+    ]
+
+    exec('\n'.join(source), namespace)  # noqa: exec-used
+    encode = namespace['encode']
+    encode.format = format
+    encode.keys = tuple(key for key, _ in shape)
+    return encode
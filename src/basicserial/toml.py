@@ -4,37 +4,55 @@
 
 import datetime
 import decimal
-import enum
 import fractions
 import uuid
 
-from collections import (
-    OrderedDict,
-    UserDict,
-    UserList,
-    UserString,
-)
+from collections import UserString
 from importlib import import_module
 
-from .util import convert_datetimes, Implementation, ImplementationRegistry
+from .util import (
+    build_decoder,
+    convert_datetimes,
+    recursion_guard,
+    Implementation,
+    ImplementationRegistry,
+    Limits,
+    Normalizer,
+)
 
 
 class TomlImplementation(Implementation):
+    supports_datetimes = True
+
     def serialize(self, value, pretty=False):
         return self._module.dumps(value).rstrip()
 
-    def deserialize(self, value, native_datetimes=True):
-        result = self._module.loads(value)
+    def deserialize(
+            self,
+            value,
+            native_datetimes=True,
+            limits=None):
+        if limits is not None:
+            limits.check_size(value)
+        result = self._load(value)
+        if limits is not None:
+            limits.check_structure(result)
 
         if native_datetimes:
             result = convert_datetimes(result)
 
         return result
 
+    def _load(self, value):
+        return self._module.loads(value)
+
 
 class PyTomlImplementation(TomlImplementation):
     module_name = 'pytoml'
 
+    # pytoml can't write dates or times, and treats naive datetimes as UTC.
+    supports_datetimes = False
+
 
 class PlainTomlImplementation(TomlImplementation):
     module_name = 'toml'
@@ -47,6 +65,15 @@ class QTomlImplementation(TomlImplementation):
 class TomlKitTomlImplementation(TomlImplementation):
     module_name = 'tomlkit'
 
+    def _load(self, value):
+        document = self._module.loads(value)
+
+        # Older versions of tomlkit can't unwrap their containers.
+        unwrap = getattr(document, 'unwrap', None)
+        if unwrap:
+            return unwrap()
+        return document
+
 
 class TomliTomlImplementation(TomlImplementation):
     module_name = 'tomli'
@@ -74,38 +101,51 @@ IMPLEMENTATIONS.register('tomlkit', TomlKitTomlImplementation)
 IMPLEMENTATIONS.register('tomli', TomliTomlImplementation)
 
 
-def _make_toml_friendly(value):  # noqa: too-many-return-statements
-    if isinstance(value, tuple) and hasattr(value, '_fields'):
-        return _make_toml_friendly(value._asdict())
-
-    if isinstance(value, (dict, UserDict)):
-        return OrderedDict([
-            (key, _make_toml_friendly(value[key]))
-            for key in value
-        ])
-
-    if isinstance(value, (set, frozenset, tuple, UserList)):
-        return [
-            _make_toml_friendly(element)
-            for element in value
-        ]
-
-    if isinstance(value, decimal.Decimal):
-        return float(value)
-
-    if isinstance(value, (datetime.date, datetime.time)):
+def _encode_temporal(value):
+    # TOML has no notion of a time with an offset.
+    if isinstance(value, datetime.time) and value.tzinfo is not None:
         return value.isoformat()
+    return value
 
-    if isinstance(value, (UserString, complex, fractions.Fraction, uuid.UUID)):
-        return str(value)
-
-    if isinstance(value, enum.Enum):
-        return value.value
 
-    return value
+TOML_NATIVE_TYPES = (str, int, float, bool)
 
+ENCODINGS = (
+    (decimal.Decimal, float),
+    (UserString, str),
+    (complex, str),
+    (fractions.Fraction, str),
+    (uuid.UUID, str),
+)
 
-def to_toml(value, pretty=False, pkg=None):
+_NORMALIZERS = {
+    True: Normalizer(
+        TOML_NATIVE_TYPES,
+        ((datetime.date, _encode_temporal), (datetime.time, _encode_temporal))
+        + ENCODINGS,
+    ),
+    False: Normalizer(
+        TOML_NATIVE_TYPES,
+        ((datetime.date, lambda x: x.isoformat()),
+         (datetime.time, lambda x: x.isoformat()))
+        + ENCODINGS,
+    ),
+}
+
+
+def _make_toml_friendly(value, native_datetimes=True, memo=None):
+    return _NORMALIZERS[native_datetimes](value, memo=memo)
+
+
+@recursion_guard
+def to_toml(
+        value,
+        pretty=False,
+        pkg=None,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None,
+        memo=None):
     """
     Serializes the given value to TOML.
 
@@ -118,14 +158,60 @@ def to_toml(value, pretty=False, pkg=None):
         the TOML package to use for serialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param max_bytes:
+        the maximum size of the output, in bytes; if not specified, there is
+        no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the value, checked before it is
+        serialized; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        in the value, checked before it is serialized; if not specified,
+        there is no limit
+    :type max_nodes: int
+    :param memo:
+        an ``EncodeMemo`` to reuse (and remember) the conversions of
+        immutable containers, such as tuples, across multiple calls
+    :type memo: EncodeMemo
+    :raises LimitExceededError: if the value exceeds one of the limits
+    :raises ValueError: if the value contains itself
     :rtype: str
     """
 
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.serialize(_make_toml_friendly(value), pretty=pretty)
-
-
-def from_toml(value, native_datetimes=True, pkg=None):
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if limits is not None:
+        limits.check_structure(value)
+
+    result = impl.serialize(
+        _make_toml_friendly(
+            value,
+            native_datetimes=impl.supports_datetimes,
+            memo=memo,
+        ),
+        pretty=pretty,
+    )
+
+    if limits is not None:
+        limits.check_size(result)
+    return result
+
+
+@recursion_guard
+def from_toml(
+        value,
+        native_datetimes=True,
+        pkg=None,
+        into=None,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None):
     """
     Deserializes the given value from TOML.
 
@@ -133,14 +219,48 @@ def from_toml(value, native_datetimes=True, pkg=None):
     :type value: str
     :param native_datetimes:
         whether or not strings that look like dates/times should be
-        automatically cast to the native objects, or left as strings; if not
-        specified, defaults to ``True``
+        automatically cast to the native objects, or left as strings; TOML's
+        own date/time values are always returned as native objects, so
+        disabling this just skips a pass over the result; if not specified,
+        defaults to ``True``
     :type native_datetimes: bool
     :param pkg:
         the TOML package to use for deserialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param into:
+        the type to decode the value into, such as a dataclass; strings are
+        only converted to dates/times where the type calls for them, so
+        ``native_datetimes`` is ignored
+    :type into: type
+    :param max_bytes:
+        the maximum size of the value, in bytes; checked before it is parsed;
+        if not specified, there is no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the decoded value; checked before any
+        dates/times are cast; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        in the decoded value; checked before any dates/times are cast; if not
+        specified, there is no limit
+    :type max_nodes: int
+    :raises LimitExceededError: if the value exceeds one of the limits
     """
 
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.deserialize(value, native_datetimes=native_datetimes)
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if into is not None:
+        return build_decoder(into)(
+            impl.deserialize(value, native_datetimes=False, limits=limits),
+        )
+    return impl.deserialize(
+        value,
+        native_datetimes=native_datetimes,
+        limits=limits,
+    )
@@ -0,0 +1,246 @@
+#
+# Copyright (c) 2018, Jason Simeone
+#
+
+from .json import (
+    IMPLEMENTATIONS as JSON_IMPLEMENTATIONS,
+    _make_json_friendly,
+)
+from .toml import (
+    IMPLEMENTATIONS as TOML_IMPLEMENTATIONS,
+    _make_toml_friendly,
+)
+from .yaml import (
+    IMPLEMENTATIONS as YAML_IMPLEMENTATIONS,
+)
+
+
+FORMATS = ('json', 'jsonl', 'yaml', 'toml')
+
+# The formats that can represent dates/times natively; for the others there
+# is no point converting strings that look like dates/times, as they would
+# just be written back out as strings.
+NATIVE_DATETIME_FORMATS = ('yaml', 'toml')
+
+# The formats that can hold any number of documents.
+MULTI_DOCUMENT_FORMATS = ('jsonl', 'yaml')
+
+_MISSING = object()
+
+
+def _check_format(format):  # noqa: redefined-builtin
+    if format not in FORMATS:
+        raise ValueError('"%s" is not a supported format' % (format,))
+
+
+def _read(src):
+    if hasattr(src, 'read'):
+        return src.read()
+    return src
+
+
+def _iter_lines(src):
+    if not isinstance(src, (str, bytes)):
+        yield from src
+        return
+
+    newline = '\n' if isinstance(src, str) else b'\n'
+    start = 0
+    while start < len(src):
+        end = src.find(newline, start)
+        if end < 0:
+            end = len(src)
+        yield src[start:end]
+        start = end + 1
+
+
+def _iter_documents(
+        src,
+        format,  # noqa: redefined-builtin
+        pkg,
+        native_datetimes):
+    if format == 'json':
+        impl = JSON_IMPLEMENTATIONS.get(pkg)
+        yield impl.deserialize(_read(src), native_datetimes=native_datetimes)
+
+    elif format == 'jsonl':
+        impl = JSON_IMPLEMENTATIONS.get(pkg)
+        for line in _iter_lines(src):
+            if line.strip():
+                yield impl.deserialize(line, native_datetimes=native_datetimes)
+
+    elif format == 'yaml':
+        impl = YAML_IMPLEMENTATIONS.get(pkg)
+        yield from impl.deserialize_all(
+            src,
+            native_datetimes=native_datetimes,
+        )
+
+    else:
+        impl = TOML_IMPLEMENTATIONS.get(pkg)
+        yield impl.deserialize(_read(src), native_datetimes=native_datetimes)
+
+
+def _iter_elements(documents):
+    # Spreads the elements of top-level arrays out into documents of their
+    # own.
+    for document in documents:
+        if isinstance(document, list):
+            yield from document
+        else:
+            yield document
+
+
+def _serialize_json(impl, document, pretty):
+    # Converted the same way as in to_json(), so the output doesn't depend on
+    # which types the package happens to handle itself. Documents that need
+    # no changes aren't copied.
+    return impl.serialize(
+        _make_json_friendly(document, native_numpy=impl.native_numpy),
+        pretty=pretty,
+    )
+
+
+def _write_json(documents, out_stream, pkg, pretty):
+    impl = JSON_IMPLEMENTATIONS.get(pkg)
+    if pretty:
+        separator = ',\n'
+    else:
+        # Use the same separator between documents as the package uses
+        # between elements.
+        separator = impl.serialize([0, 0])[2:-2]
+
+    out_stream.write('[')
+    count = 0
+    for document in documents:
+        if count:
+            out_stream.write(separator)
+        out_stream.write(_serialize_json(impl, document, pretty))
+        count += 1
+    out_stream.write(']')
+    return count
+
+
+def _write_json_document(documents, out_stream, pkg, pretty):
+    impl = JSON_IMPLEMENTATIONS.get(pkg)
+    count = 0
+    for document in documents:
+        out_stream.write(_serialize_json(impl, document, pretty))
+        count += 1
+    return count
+
+
+def _write_jsonl(documents, out_stream, pkg, pretty):  # noqa: unused-argument
+    impl = JSON_IMPLEMENTATIONS.get(pkg)
+    count = 0
+    for document in documents:
+        out_stream.write(_serialize_json(impl, document, False))
+        out_stream.write('\n')
+        count += 1
+    return count
+
+
+def _write_yaml(documents, out_stream, pkg, pretty):
+    impl = YAML_IMPLEMENTATIONS.get(pkg)
+    count = 0
+    for document in documents:
+        if count:
+            out_stream.write('---\n')
+        out_stream.write(impl.serialize(document, pretty=pretty))
+        out_stream.write('\n')
+        count += 1
+    return count
+
+
+def _write_toml(documents, out_stream, pkg, pretty):
+    impl = TOML_IMPLEMENTATIONS.get(pkg)
+
+    document = next(documents, _MISSING)
+    if document is _MISSING:
+        return 0
+    if next(documents, _MISSING) is not _MISSING:
+        raise ValueError('TOML can only hold a single document')
+
+    out_stream.write(impl.serialize(
+        _make_toml_friendly(
+            document,
+            native_datetimes=impl.supports_datetimes,
+        ),
+        pretty=pretty,
+    ))
+    out_stream.write('\n')
+    return 1
+
+
+WRITERS = {
+    'json': _write_json,
+    'jsonl': _write_jsonl,
+    'yaml': _write_yaml,
+    'toml': _write_toml,
+}
+
+
+def transcode(
+        src,
+        src_format,
+        dst_format,
+        out_stream,
+        pretty=False,
+        src_pkg=None,
+        dst_pkg=None):
+    """
+    Converts the given value from one format to another, one document at a
+    time, writing the result to a stream.
+
+    Only one document is held in memory at a time. YAML streams and JSON
+    Lines are always written to JSON as an array (however many documents they
+    hold), while a JSON or TOML document is written as-is. When writing JSON
+    Lines from JSON, each element of a top-level array is written as a line
+    of its own. Documents are separated by ``---`` in YAML. TOML can only
+    hold a single document.
+
+    When the destination format can't represent dates/times natively (JSON
+    and JSON Lines), strings that look like dates/times are passed through
+    as they appear in the source, rather than being parsed and re-encoded.
+
+    :param src:
+        the value to convert; either a string, or a file-like object open in
+        text mode (JSON Lines may also be given as an iterable of lines)
+    :param src_format:
+        the format of ``src`` (``json``, ``jsonl``, ``yaml``, or ``toml``)
+    :type src_format: str
+    :param dst_format:
+        the format to write (``json``, ``jsonl``, ``yaml``, or ``toml``)
+    :type dst_format: str
+    :param out_stream: a file-like object open in text mode to write to
+    :param pretty:
+        whether or not to format the output in a more human-readable way; if
+        not specified, defaults to ``False``
+    :type pretty: bool
+    :param src_pkg:
+        the package to use to read ``src``; if not specified, uses the first
+        supported package found in the environment
+    :type src_pkg: str
+    :param dst_pkg:
+        the package to use to write the output; if not specified, uses the
+        first supported package found in the environment
+    :type dst_pkg: str
+    :returns: the number of documents written
+    :rtype: int
+    """
+
+    _check_format(src_format)
+    _check_format(dst_format)
+
+    documents = _iter_documents(
+        src,
+        src_format,
+        src_pkg,
+        native_datetimes=dst_format in NATIVE_DATETIME_FORMATS,
+    )
+    writer = WRITERS[dst_format]
+    if dst_format == 'json' and src_format not in MULTI_DOCUMENT_FORMATS:
+        writer = _write_json_document
+    elif dst_format == 'jsonl' and src_format == 'json':
+        documents = _iter_elements(documents)
+    return writer(documents, out_stream, dst_pkg, pretty)
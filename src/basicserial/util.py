@@ -2,11 +2,25 @@
 # Copyright (c) 2018, Jason Simeone
 #
 
+import collections.abc
+import dataclasses
 import datetime
+import decimal
+import enum
+import functools
+import os
 import re
+import sys
+import sysconfig
+import typing
+import uuid
 
-from collections import OrderedDict
+from array import array
+from collections import OrderedDict, UserDict, UserList, UserString
 from importlib import import_module
+from itertools import repeat
+from operator import attrgetter
+from types import MappingProxyType
 
 import iso8601
 
@@ -54,6 +68,18 @@ class ImplementationRegistry:
     def register(self, package, clazz):
         self.implementations[package] = clazz()
 
+    def get_preferred(self, packages):
+        """
+        Returns the first available implementation from the given package
+        names, or the default implementation if none of them are available.
+        """
+
+        for package in packages:
+            impl = self.implementations.get(package)
+            if impl and impl.is_available():
+                return impl
+        return self.get()
+
     def get(self, package=None):
         if package:
             impl = self.implementations.get(package)
@@ -78,6 +104,664 @@ class ImplementationRegistry:
         )
 
 
+def _get_numpy_types():
+    # NumPy is slow to import, so it's never imported just to check a value;
+    # if it hasn't been imported, the value can't be from it.
+    numpy = sys.modules.get('numpy')
+    if numpy is None:
+        return None
+    return (numpy.ndarray, numpy.generic)
+
+
+@functools.lru_cache(maxsize=None)
+def _import_numpy():
+    try:
+        return import_module('numpy')
+    except ImportError:  # pragma: no cover
+        return None
+
+
+def is_numpy(value):
+    numpy_types = _get_numpy_types()
+    return numpy_types is not None and isinstance(value, numpy_types)
+
+
+def is_plain_numpy(value):
+    """
+    Whether the Python equivalent of the given NumPy array or scalar consists
+    only of booleans, numbers, and strings.
+    """
+
+    return value.dtype.kind in 'biufU'
+
+
+def numpy_to_python(value):
+    """
+    Converts a NumPy array or scalar to the equivalent Python objects in bulk.
+    """
+
+    numpy = sys.modules['numpy']
+
+    if value.dtype.kind == 'M':
+        unit = numpy.datetime_data(value.dtype)[0]
+        if unit in ('ns', 'ps', 'fs', 'as'):
+            # These resolutions would otherwise come back as plain integers.
+            value = value.astype('datetime64[us]')
+
+    if isinstance(value, numpy.ndarray):
+        return value.tolist()
+    return value.item()
+
+
+_FIELD_PLANS = {}
+_STDLIB_PATH = os.path.abspath(sysconfig.get_paths()['stdlib'])
+_SITE_PACKAGES_PATHS = tuple(
+    os.path.abspath(sysconfig.get_paths()[name])
+    for name in ('purelib', 'platlib')
+)
+_MISSING = object()
+
+
+def _is_stdlib_class(cls):
+    name = cls.__module__.partition('.')[0]
+    if name == '__main__':
+        return False
+    if hasattr(sys, 'stdlib_module_names'):
+        return name in sys.stdlib_module_names
+    if name in sys.builtin_module_names:
+        return True
+
+    # Modules without a file (e.g. ones created on the fly) can't be told
+    # apart by their location, so they're assumed not to be in the stdlib.
+    path = getattr(sys.modules.get(name), '__file__', None)
+    if path is None:
+        return False
+    path = os.path.abspath(path)
+    return path.startswith(_STDLIB_PATH) \
+        and not path.startswith(_SITE_PACKAGES_PATHS)
+
+
+def _get_slot_attributes(cls):
+    # Only the public slots of classes outside the stdlib are used; the
+    # private state of things like paths and IP addresses is not meant to be
+    # written out.
+    if _is_stdlib_class(cls):
+        return []
+
+    attributes = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        attributes.extend(
+            (name, name)
+            for name in slots
+            if not name.startswith('_')
+        )
+    return attributes
+
+
+def _build_field_plan(cls):
+    if dataclasses.is_dataclass(cls):
+        attributes = [
+            (field.name, field.name)
+            for field in dataclasses.fields(cls)
+        ]
+    elif hasattr(cls, '__attrs_attrs__'):
+        attributes = [
+            (attribute.name, attribute.name)
+            for attribute in cls.__attrs_attrs__
+        ]
+    else:
+        attributes = _get_slot_attributes(cls)
+        if not attributes:
+            return None
+
+    names = tuple(name for name, _ in attributes)
+    attrs = tuple(attr for _, attr in attributes)
+    if len(attrs) == 1:
+        single = attrgetter(attrs[0])
+        getter = lambda obj: (single(obj),)
+    elif attrs:
+        getter = attrgetter(*attrs)
+    else:
+        getter = lambda obj: ()
+    return names, attrs, getter
+
+
+def _get_field_plan(cls):
+    try:
+        return _FIELD_PLANS[cls]
+    except KeyError:
+        plan = _FIELD_PLANS[cls] = _build_field_plan(cls)
+        return plan
+
+
+def get_fields(value):
+    """
+    Returns a dict of the fields of a dataclass or attrs instance, or of the
+    public ``__slots__`` of an instance of a class outside the stdlib, or
+    ``None`` if the value is not one of those. The list of fields is only
+    determined once per class.
+    """
+
+    plan = _get_field_plan(type(value))
+
+    if plan is None:
+        return None
+
+    names, attrs, getter = plan
+    try:
+        return dict(zip(names, getter(value)))
+    except AttributeError:
+        # Some slots haven't been assigned; leave them out.
+        fields = {}
+        for name, attr in zip(names, attrs):
+            field = getattr(value, attr, _MISSING)
+            if field is not _MISSING:
+                fields[name] = field
+        return fields
+
+
+def check_encoder(encoder, format):  # noqa: redefined-builtin
+    """
+    Raises a ValueError if the given record encoder was compiled for a format
+    other than the given one.
+    """
+
+    compiled = getattr(encoder, 'format', format)
+    if compiled != format:
+        raise ValueError(
+            'The encoder was compiled for %s, not %s' % (compiled, format)
+        )
+
+
+def apply_encoder(value, encoder):
+    """
+    Applies a record encoder to each element of a list or tuple of records,
+    or to the value itself if it's a single record.
+    """
+
+    if isinstance(value, (list, tuple)) and not hasattr(value, '_fields'):
+        return [encoder(record) for record in value]
+    return encoder(value)
+
+
+# How the Normalizer handles each type of value.
+_PASS = 'pass'          # left as-is
+_SCALAR = 'scalar'      # replaced by the result of a function
+_EXPAND = 'expand'      # replaced by the result of a function, then handled
+_LIST = 'list'          # a list, whose elements are handled
+_SEQUENCE = 'sequence'  # another sequence, turned into a list
+_DICT = 'dict'          # a dict, whose values are handled
+_MAPPING = 'mapping'    # another mapping, turned into a dict
+
+_FROZEN_TYPES = (tuple, frozenset)
+
+# Containers are only remembered by the Normalizer if they hold at least this
+# many values (counting those in nested containers).
+_MEMO_MIN_NODES = 64
+
+# The nesting depth past which the Normalizer starts looking for cycles.
+_CYCLE_CHECK_DEPTH = 1000
+
+
+def _expand_namedtuple(value):
+    return dict(zip(value._fields, value)), False
+
+
+def _expand_enum(value):
+    return value.value, False
+
+
+def _expand_fields(value):
+    return get_fields(value), False
+
+
+def _expand_numpy(value):
+    if is_plain_numpy(value):
+        return numpy_to_python(value), True
+    return numpy_to_python(value), False
+
+
+class Normalizer:
+    """
+    Converts a value into one made up only of the types that a serialization
+    package can handle, without recursion. Containers whose contents need no
+    changes are returned as-is rather than copied, and other mappings and
+    sequences are turned into plain dicts and lists (in the same order).
+    Large containers are only converted once, however many times they are
+    referenced.
+
+    :param native_types:
+        the types the package handles itself, which are left as-is
+    :type native_types: tuple
+    :param encoders:
+        ``(type, function)`` pairs, checked in order, for the values that
+        must be replaced with something the package can handle
+    :type encoders: tuple
+    :param numpy_encoder:
+        a function that returns a ``(value, done)`` pair for NumPy arrays and
+        scalars, where ``done`` says whether the value needs no further
+        conversion; if not specified, they are converted to the equivalent
+        Python objects
+    :type numpy_encoder: function
+    """
+
+    def __init__(self, native_types, encoders, numpy_encoder=None):
+        self._native_types = frozenset(native_types)
+        self._encoders = tuple(encoders)
+        self._numpy_encoder = numpy_encoder or _expand_numpy
+        self._handlers = {}
+
+    def _find_handler(self, typ):  # noqa: too-many-return-statements
+        if typ in self._native_types:
+            return _PASS, None
+        if issubclass(typ, tuple) and hasattr(typ, '_fields'):
+            return _EXPAND, _expand_namedtuple
+        if typ is dict:
+            return _DICT, None
+        if issubclass(typ, (dict, UserDict)):
+            return _MAPPING, None
+        if typ is list:
+            return _LIST, None
+        if issubclass(typ, (list, set, frozenset, tuple, UserList)):
+            return _SEQUENCE, None
+        if issubclass(typ, enum.Enum):
+            return _EXPAND, _expand_enum
+        numpy_types = _get_numpy_types()
+        if numpy_types is not None and issubclass(typ, numpy_types):
+            return _EXPAND, self._numpy_encoder
+        for encoding, encoder in self._encoders:
+            if issubclass(typ, encoding):
+                return _SCALAR, encoder
+        if _get_field_plan(typ) is not None:
+            return _EXPAND, _expand_fields
+        return _PASS, None
+
+    def _get_handler(self, typ):
+        handler = self._handlers.get(typ)
+        if handler is None:
+            handler = self._handlers[typ] = self._find_handler(typ)
+        return handler
+
+    def __call__(self, value, memo=None):  # noqa: complex
+        """
+        :param value: the value to convert
+        :param memo:
+            a cache of the conversions of immutable containers to reuse, and
+            add to; if not specified, conversions are only reused within
+            this call
+        :type memo: EncodeMemo
+        :raises ValueError: if the value contains itself
+        """
+
+        handlers = self._handlers
+        get_handler = self._get_handler
+        shared = memo._get_table(self) if memo is not None else None
+
+        # Each frame is [source, original, kind, keys, values, converted,
+        # position, frozen, start]. The source is the container as it was
+        # found, and the original is what it expanded to. The converted values
+        # are only collected once one of them differs from the original.
+        # Frozen says whether the container and everything in it is immutable
+        # (only tracked for a shared memo), and start is the count of values
+        # walked before it. The value itself is held by a one-element list at
+        # the bottom.
+        stack = [[None, None, _LIST, None, [value], None, 0, False, 0]]
+        walked = 0
+
+        # Large containers are remembered once converted, by the id of their
+        # source, as (source, result, frozen, nodes), so that each is only
+        # converted once however many times it is referenced. Smaller ones
+        # are cheaper to convert again than to remember. Holding the source
+        # keeps its id from being reused.
+        remembered = {}
+
+        # The ids of the containers being converted, once the value turns out
+        # to be deep enough that it might hold a cycle.
+        active = None
+
+        while stack:
+            frame = stack[-1]
+            values, converted, pos, frozen = \
+                frame[4], frame[5], frame[6], frame[7]
+            size = len(values)
+
+            while pos < size:
+                child = values[pos]
+                kind, encoder = handlers.get(type(child)) \
+                    or get_handler(type(child))
+
+                if kind is not _PASS:
+                    entry = remembered.get(id(child)) if remembered else None
+                    if entry is None and shared is not None \
+                            and isinstance(child, _FROZEN_TYPES):
+                        entry = shared.get(id(child))
+
+                    if entry is not None:
+                        result = entry[1]
+                        frozen = frozen and entry[2]
+                        walked += entry[3]
+
+                    else:
+                        result = child
+                        while kind is _EXPAND:
+                            result, done = encoder(result)
+                            kind, encoder = (_PASS, None) if done \
+                                else get_handler(type(result))
+                        if kind is _SCALAR:
+                            result = encoder(result)
+                            kind = _PASS
+
+                        if kind is not _PASS:
+                            if len(stack) >= _CYCLE_CHECK_DEPTH:
+                                if active is None:
+                                    active = {id(f[0]) for f in stack[1:]}
+                                if id(child) in active:
+                                    raise ValueError(
+                                        'Circular reference detected'
+                                    )
+                                active.add(id(child))
+
+                            if kind is _DICT or kind is _MAPPING:
+                                keys = list(result.keys())
+                                children = list(result.values())
+                            else:
+                                keys = None
+                                children = result if kind is _LIST \
+                                    else list(result)
+                            frame[5], frame[6], frame[7] = \
+                                converted, pos, frozen
+                            stack.append([
+                                child,
+                                result,
+                                kind,
+                                keys,
+                                children,
+                                None,
+                                0,
+                                shared is not None
+                                and isinstance(child, _FROZEN_TYPES),
+                                walked,
+                            ])
+                            break
+
+                        # A value converted from something mutable could go
+                        # stale.
+                        if frozen and type(child).__hash__ is None:
+                            frozen = False
+
+                    if result is not child and converted is None:
+                        converted = values[:pos]
+                    child = result
+
+                if converted is not None:
+                    converted.append(child)
+                pos += 1
+
+            else:
+                stack.pop()
+                if converted is None:
+                    converted = values
+                if not stack:
+                    return converted[0]
+
+                source, original, kind, keys = \
+                    frame[0], frame[1], frame[2], frame[3]
+                if kind is _LIST:
+                    result = original if converted is values else converted
+                elif kind is _DICT:
+                    result = original if converted is values \
+                        else dict(zip(keys, converted))
+                elif kind is _MAPPING:
+                    result = dict(zip(keys, converted))
+                else:
+                    result = converted
+
+                if active is not None:
+                    active.discard(id(source))
+                walked += size
+                nodes = walked - frame[8]
+                if nodes >= _MEMO_MIN_NODES or frozen:
+                    entry = (source, result, frozen, nodes)
+                    remembered[id(source)] = entry
+                    if frozen and len(shared) < memo.max_size:
+                        shared[id(source)] = entry
+
+                parent = stack[-1]
+                pos = parent[6]
+                if parent[5] is None and result is not parent[4][pos]:
+                    parent[5] = parent[4][:pos]
+                if parent[5] is not None:
+                    parent[5].append(result)
+                parent[6] = pos + 1
+                if not frozen:
+                    parent[7] = False
+
+        return None  # pragma: no cover
+
+
+DEFAULT_MEMO_SIZE = 4096
+
+
+class EncodeMemo:
+    """
+    A bounded cache of the conversions of immutable containers (tuples,
+    frozensets, and named tuples, whose contents are all immutable as well),
+    to share across multiple calls that prepare values for serialization, so
+    that containers referenced from many documents are only converted once.
+
+    The cache holds a reference to each container it remembers.
+
+    :param max_size:
+        the maximum number of containers to remember; once full, new
+        containers are converted but not remembered
+    :type max_size: int
+    """
+
+    def __init__(self, max_size=DEFAULT_MEMO_SIZE):
+        self.max_size = max_size
+        self._tables = {}
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def clear(self):
+        """
+        Forgets all the containers remembered so far.
+        """
+
+        self._tables.clear()
+
+    def _get_table(self, owner):
+        # Conversions differ between formats and packages, so each
+        # Normalizer gets a table of its own.
+        table = self._tables.get(owner)
+        if table is None:
+            table = self._tables[owner] = {}
+        return table
+
+
+class LimitExceededError(ValueError):
+    """
+    Raised when a value exceeds one of the resource limits (size, nesting
+    depth, number of nodes, or YAML alias expansion) given to a
+    serialization function.
+    """
+
+
+# Values that never hold other values, and so can be skipped quickly when
+# walking a structure.
+_LEAF_TYPES = frozenset((
+    str,
+    bytes,
+    int,
+    float,
+    bool,
+    type(None),
+    datetime.date,
+    datetime.datetime,
+    datetime.time,
+    decimal.Decimal,
+    uuid.UUID,
+))
+
+
+def _get_children(value):
+    # Returns the values held by a container, and whether they have keys.
+    if isinstance(value, collections.abc.Mapping):
+        return value.values(), True
+    if isinstance(value, (list, tuple, set, frozenset, UserList)):
+        return value, False
+    if isinstance(value, (str, bytes, UserString, enum.Enum)) \
+            or is_numpy(value):
+        return None, False
+    fields = get_fields(value)
+    if fields is not None:
+        return fields.values(), True
+    return None, False
+
+
+class Limits:
+    """
+    The resource limits for a single serialization call. The number of nodes
+    is counted across every check made with the same instance.
+    """
+
+    def __init__(
+            self,
+            max_bytes=None,
+            max_depth=None,
+            max_nodes=None,
+            max_alias_expansions=None):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_alias_expansions = max_alias_expansions
+        self.nodes = 0
+        self.alias_expansions = 0
+
+    @classmethod
+    def build(cls, **limits):
+        """
+        Returns a ``Limits`` for the given limits, or ``None`` if none of
+        them were specified.
+        """
+
+        for name, limit in limits.items():
+            if limit is not None and limit < 0:
+                raise ValueError('%s cannot be negative' % (name,))
+        if all(limit is None for limit in limits.values()):
+            return None
+        return cls(**limits)
+
+    def check_size(self, value):
+        """
+        Checks the size of a string (in UTF-8) or buffer.
+        """
+
+        if self.max_bytes is None:
+            return
+        size = len(value)
+        if isinstance(value, str) and size <= self.max_bytes < size * 4:
+            # Only encode when the answer depends on it.
+            size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            raise LimitExceededError(
+                'Value exceeds the maximum size of %s bytes' % (
+                    self.max_bytes,
+                )
+            )
+
+    def read(self, stream):
+        """
+        Reads a stream, without reading more than the maximum size.
+        """
+
+        if self.max_bytes is None:
+            return stream.read()
+        value = stream.read(self.max_bytes + 1)
+        self.check_size(value)
+        return value
+
+    def check_depth(self, depth):
+        if self.max_depth is not None and depth > self.max_depth:
+            raise LimitExceededError(
+                'Value exceeds the maximum nesting depth of %s' % (
+                    self.max_depth,
+                )
+            )
+
+    def add_nodes(self, count):
+        self.nodes += count
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise LimitExceededError(
+                'Value exceeds the maximum of %s nodes' % (self.max_nodes,)
+            )
+
+    def add_alias_expansion(self, count):
+        self.alias_expansions += count
+        if self.max_alias_expansions is not None \
+                and self.alias_expansions > self.max_alias_expansions:
+            raise LimitExceededError(
+                'Aliases exceed the maximum of %s expanded nodes' % (
+                    self.max_alias_expansions,
+                )
+            )
+
+    def check_structure(self, value):
+        """
+        Checks the nesting depth and number of nodes (containers, mapping keys,
+        and scalars) of a value, stopping as soon as a limit is exceeded (so
+        cyclic and very large values are rejected early).
+        """
+
+        if self.max_depth is None and self.max_nodes is None:
+            return
+
+        # Nodes are counted as their container is reached, so a large
+        # container is rejected before any of its contents are visited.
+        self.add_nodes(1)
+        stack = [(value, 0)]
+        while stack:
+            value, depth = stack.pop()
+            typ = type(value)
+            if typ in _LEAF_TYPES:
+                continue
+            if typ is dict:
+                children = value.values()
+                self.add_nodes(2 * len(value))
+            elif typ is list:
+                children = value
+                self.add_nodes(len(value))
+            else:
+                children, keyed = _get_children(value)
+                if children is None:
+                    continue
+                self.add_nodes(2 * len(children) if keyed else len(children))
+            depth += 1
+            self.check_depth(depth)
+            stack.extend(zip(children, repeat(depth)))
+
+
+def recursion_guard(func):
+    """
+    Reports a ``RecursionError`` raised while handling a deeply nested value
+    as a ``LimitExceededError``.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except RecursionError:
+            raise LimitExceededError(
+                'Value exceeds the maximum nesting depth that can be handled'
+            ) from None
+    return wrapper
+
+
 RE_DATE = re.compile(
     r'^\d{4}-\d{2}-\d{2}$',
 )
@@ -89,6 +773,11 @@ RE_DATETIME = re.compile(
 )
 
 
+RE_DATELIKE = re.compile(
+    r'^\d{2}(\d{2}-\d{2}-\d{2}|:\d{2}:\d{2})',
+)
+
+
 def get_date_or_string(value):  # noqa: complex
     if RE_DATETIME.match(value):
         try:
@@ -137,3 +826,451 @@ def convert_datetimes(value):
 
     return dict(results)
 
+
+DEFAULT_INTERN_SIZE = 65536
+DEFAULT_INTERN_LENGTH = 64
+
+
+class InternTable:
+    """
+    A bounded table used to share a single copy of strings that repeat across
+    a decoded document (or across several documents, if the same table is
+    reused).
+
+    :param max_size:
+        the maximum number of distinct strings to hold; once full, new strings
+        are passed through untouched
+    :type max_size: int
+    :param max_length:
+        strings longer than this are never interned, as they are unlikely to
+        repeat
+    :type max_length: int
+    """
+
+    def __init__(
+            self,
+            max_size=DEFAULT_INTERN_SIZE,
+            max_length=DEFAULT_INTERN_LENGTH):
+        self.max_size = max_size
+        self.max_length = max_length
+        self._table = {}
+
+    def __call__(self, value):
+        interned = self._table.get(value)
+        if interned is not None:
+            return interned
+
+        if len(value) <= self.max_length \
+                and len(self._table) < self.max_size:
+            self._table[value] = value
+        return value
+
+
+def convert_decoded(  # noqa: complex
+        value,
+        native_datetimes=True,
+        interner=None,
+        frozen=False,
+        native_datetime_keys=False):
+    if isinstance(value, str):
+        if native_datetimes:
+            converted = get_date_or_string(value)
+            if converted is not value:
+                return converted
+        if interner is not None:
+            return interner(value)
+        return value
+
+    if isinstance(value, dict):
+        result = {}
+        for key, val in value.items():
+            if isinstance(key, str):
+                if native_datetime_keys:
+                    key = get_date_or_string(key)
+                if interner is not None and isinstance(key, str):
+                    key = interner(key)
+            result[key] = convert_decoded(
+                val,
+                native_datetimes,
+                interner,
+                frozen,
+                native_datetime_keys,
+            )
+        if frozen:
+            return MappingProxyType(result)
+        return result
+
+    if isinstance(value, list):
+        result = [
+            convert_decoded(
+                element,
+                native_datetimes,
+                interner,
+                frozen,
+                native_datetime_keys,
+            )
+            for element in value
+        ]
+        if frozen:
+            return tuple(result)
+        return result
+
+    return value
+
+
+def _parse_datetime(value):
+    try:
+        return iso8601.parse_date(value, default_timezone=None)
+    except iso8601.ParseError:
+        return get_date_or_string(value)
+
+
+def _parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _parse_time(value):
+    try:
+        return datetime.time.fromisoformat(value)
+    except ValueError:
+        return get_date_or_string(value)
+
+
+BULK_DATE_PARSERS = (
+    (RE_DATETIME, _parse_datetime),
+    (RE_DATE, _parse_date),
+    (RE_TIME, _parse_time),
+)
+
+
+def _convert_string_column(values):
+    if not any(map(RE_DATELIKE.match, values)):
+        return values
+
+    for regex, parser in BULK_DATE_PARSERS:
+        if all(map(regex.match, values)):
+            return list(map(parser, values))
+
+    return list(map(get_date_or_string, values))
+
+
+def _compact_column(  # noqa: complex
+        values,
+        native_datetimes=True,
+        frozen=False):
+    types = set(map(type, values))
+    numpy = _import_numpy()
+
+    if types == {bool}:
+        if numpy is not None:
+            return numpy.array(values, dtype=numpy.bool_)
+        return values
+
+    if types == {int}:
+        try:
+            if numpy is not None:
+                return numpy.array(values, dtype=numpy.int64)
+            return array('q', values)
+        except OverflowError:
+            return values
+
+    if types in ({float}, {int, float}):
+        if numpy is not None:
+            return numpy.array(values, dtype=numpy.float64)
+        return array('d', values)
+
+    if native_datetimes and types == {str}:
+        return _convert_string_column(values)
+
+    if (native_datetimes and str in types) \
+            or ((native_datetimes or frozen) and types & {dict, list}):
+        return [
+            convert_decoded(value, native_datetimes, frozen=frozen)
+            if isinstance(value, (str, dict, list)) else value
+            for value in values
+        ]
+
+    return values
+
+
+def to_columns(records, native_datetimes=True, frozen=False):
+    """
+    Pivots a list of dicts into a dict of column names to sequences of
+    values. Records that lack a column get ``None`` in its place. Objects
+    and arrays nested within the cells are converted the same way as in the
+    records layout.
+    """
+
+    if not isinstance(records, (list, tuple)):
+        raise ValueError('A columnar layout requires an array of objects')
+
+    names = {}
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError('A columnar layout requires an array of objects')
+        for name in record:
+            if name not in names:
+                names[name] = None
+
+    columns = {}
+    for name in names:
+        column = _compact_column(
+            [record.get(name) for record in records],
+            native_datetimes=native_datetimes,
+            frozen=frozen,
+        )
+        if frozen and isinstance(column, list):
+            column = tuple(column)
+        columns[name] = column
+
+    if frozen:
+        return MappingProxyType(columns)
+    return columns
+
+
+_DECODERS = {}
+
+
+class _Decoder:
+    # A late-bound reference to a decoder, so that types which refer to
+    # themselves can be compiled.
+
+    def __init__(self):
+        self.decode = None
+
+    def __call__(self, value):
+        return self.decode(value)
+
+
+def _decode_error(value, target):
+    return ValueError('Cannot decode %r as %s' % (
+        value,
+        getattr(target, '__name__', target),
+    ))
+
+
+def _decode_temporal(target, parser):
+    def decode(value):
+        if isinstance(value, target):
+            return value
+        if isinstance(value, str):
+            try:
+                return parser(value)
+            except ValueError:
+                pass
+        raise _decode_error(value, target)
+    return decode
+
+
+def _parse_iso_datetime(value):
+    try:
+        return iso8601.parse_date(value, default_timezone=None)
+    except iso8601.ParseError as exc:
+        raise ValueError(str(exc)) from exc
+
+
+TEMPORAL_DECODERS = {
+    datetime.datetime: _parse_iso_datetime,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+}
+
+
+def _decode_scalar(target):
+    accepted = (int, float) if target is float else target
+
+    def decode(value):
+        if type(value) is target:  # noqa: unidiomatic-typecheck
+            return value
+        if isinstance(value, accepted) and not isinstance(value, bool):
+            return target(value)
+        raise _decode_error(value, target)
+    return decode
+
+
+def _decode_constructed(target):
+    def decode(value):
+        if isinstance(value, target):
+            return value
+        if isinstance(value, float) and issubclass(target, decimal.Decimal):
+            value = repr(value)
+        try:
+            return target(value)
+        except (TypeError, ValueError, ArithmeticError) as exc:
+            raise _decode_error(value, target) from exc
+    return decode
+
+
+def _decode_union(target, members):
+    decoders = [
+        build_decoder(member)
+        for member in members
+        if member is not type(None)
+    ]
+    optional = len(decoders) != len(members)
+
+    def decode(value):
+        if value is None and optional:
+            return None
+        for decoder in decoders:
+            try:
+                return decoder(value)
+            except ValueError:
+                pass
+        raise _decode_error(value, target)
+    return decode
+
+
+def _decode_sequence(target, factory, element):
+    decoder = build_decoder(element)
+
+    def decode(value):
+        if not isinstance(value, (list, tuple)):
+            raise _decode_error(value, target)
+        return factory(decoder(element) for element in value)
+    return decode
+
+
+def _decode_tuple(target, elements):
+    decoders = [build_decoder(element) for element in elements]
+
+    def decode(value):
+        if not isinstance(value, (list, tuple)) \
+                or len(value) != len(decoders):
+            raise _decode_error(value, target)
+        return tuple(
+            decoder(element)
+            for decoder, element in zip(decoders, value)
+        )
+    return decode
+
+
+def _decode_mapping(target, key, val):
+    key_decoder = build_decoder(key)
+    value_decoder = build_decoder(val)
+
+    def decode(value):
+        if not isinstance(value, dict):
+            raise _decode_error(value, target)
+        return {
+            key_decoder(key): value_decoder(val)
+            for key, val in value.items()
+        }
+    return decode
+
+
+def _decode_dataclass(target, late):
+    hints = typing.get_type_hints(target)
+    fields = [
+        (field.name, build_decoder(hints.get(field.name, typing.Any)))
+        for field in dataclasses.fields(target)
+        if field.init
+    ]
+
+    def decode(value):
+        if isinstance(value, target):
+            return value
+        if not isinstance(value, dict):
+            raise _decode_error(value, target)
+        kwargs = {
+            name: decoder(value[name])
+            for name, decoder in fields
+            if name in value
+        }
+        try:
+            return target(**kwargs)
+        except TypeError as exc:
+            raise _decode_error(value, target) from exc
+
+    late.decode = decode
+
+
+SEQUENCE_ORIGINS = {
+    list: list,
+    set: set,
+    frozenset: frozenset,
+    collections.abc.Sequence: list,
+    collections.abc.MutableSequence: list,
+    collections.abc.Set: frozenset,
+    collections.abc.MutableSet: set,
+    collections.abc.Iterable: list,
+}
+MAPPING_ORIGINS = (
+    dict,
+    collections.abc.Mapping,
+    collections.abc.MutableMapping,
+)
+
+
+def _build_decoder(target):  # noqa: complex,too-many-return-statements
+    if target in (typing.Any, object):
+        return lambda value: value
+
+    if target is type(None):
+        def decode(value):
+            if value is not None:
+                raise _decode_error(value, target)
+            return value
+        return decode
+
+    origin = getattr(target, '__origin__', None)
+    args = getattr(target, '__args__', None) or ()
+    if origin is typing.Union:
+        return _decode_union(target, args)
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _decode_sequence(target, tuple, args[0])
+        return _decode_tuple(target, args)
+    if origin in SEQUENCE_ORIGINS:
+        return _decode_sequence(
+            target,
+            SEQUENCE_ORIGINS[origin],
+            args[0] if args else typing.Any,
+        )
+    if origin in MAPPING_ORIGINS:
+        return _decode_mapping(target, *(args or (typing.Any, typing.Any)))
+    if origin is not None:
+        raise TypeError('Cannot decode into %r' % (target,))
+
+    if dataclasses.is_dataclass(target):
+        late = _DECODERS[target] = _Decoder()
+        try:
+            _decode_dataclass(target, late)
+        except Exception:
+            del _DECODERS[target]
+            raise
+        return late
+
+    if target in TEMPORAL_DECODERS:
+        return _decode_temporal(target, TEMPORAL_DECODERS[target])
+    if target in (str, int, float, bool):
+        return _decode_scalar(target)
+    if target in (list, tuple, set, frozenset):
+        return _decode_sequence(target, target, typing.Any)
+    if target is dict:
+        return _decode_mapping(target, typing.Any, typing.Any)
+    if isinstance(target, type) \
+            and issubclass(target, (enum.Enum, decimal.Decimal, uuid.UUID)):
+        return _decode_constructed(target)
+
+    raise TypeError('Cannot decode into %r' % (target,))
+
+
+def build_decoder(target):
+    """
+    Returns a function that converts decoded values into instances of the
+    given type, which may be a dataclass, a basic type, or a ``typing``
+    construct such as ``List[...]``, ``Dict[...]``, or ``Optional[...]``.
+    The function is only compiled once per type.
+    """
+
+    try:
+        return _DECODERS[target]
+    except KeyError:
+        pass
+    decoder = _build_decoder(target)
+    _DECODERS[target] = decoder
+    return decoder
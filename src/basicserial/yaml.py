@@ -6,6 +6,7 @@ import datetime
 import decimal
 import enum
 import fractions
+import re
 import uuid
 
 from collections import (
@@ -17,13 +18,82 @@ from collections import (
 )
 from io import StringIO
 
-from .util import get_date_or_string, Implementation, ImplementationRegistry
+from .json import (
+    FAST_PACKAGES as FAST_JSON_PACKAGES,
+    IMPLEMENTATIONS as JSON_IMPLEMENTATIONS,
+)
+from .util import (
+    apply_encoder,
+    build_decoder,
+    check_encoder,
+    convert_decoded,
+    get_date_or_string,
+    get_fields,
+    is_numpy,
+    numpy_to_python,
+    Implementation,
+    ImplementationRegistry,
+    LimitExceededError,
+    Limits,
+    RE_DATELIKE,
+    recursion_guard,
+)
+
+
+STR_TAG = 'tag:yaml.org,2002:str'
+TIMESTAMP_TAG = 'tag:yaml.org,2002:timestamp'
+DATELIKE_TAG = 'tag:basicserial,2018:datelike'
 
 
 class YamlImplementation(Implementation):  # noqa: abstract-method
     pass
 
 
+class _ComposeLimiter:
+    # Enforces the limits as the document's nodes are composed, before
+    # anything is constructed from them.
+
+    def __init__(self, limits, events):
+        self.limits = limits
+        self._alias_event = events.AliasEvent
+        self._collection_event = events.CollectionStartEvent
+        self._depth = 0
+        self._anchor_sizes = {}
+
+    def compose(self, compose_node, event, parent, index):
+        limits = self.limits
+
+        if isinstance(event, self._alias_event):
+            # An alias stands for everything under its anchor, which is what
+            # anything walking the result will see.
+            size = self._anchor_sizes.get(event.anchor, 1)
+            limits.add_alias_expansion(size)
+            limits.add_nodes(size)
+            return compose_node(parent, index)
+
+        is_collection = isinstance(event, self._collection_event)
+        if is_collection:
+            self._depth += 1
+            limits.check_depth(self._depth)
+        start = limits.nodes
+        limits.add_nodes(1)
+
+        node = compose_node(parent, index)
+
+        if is_collection:
+            self._depth -= 1
+        if event.anchor is not None:
+            self._anchor_sizes[event.anchor] = limits.nodes - start
+        return node
+
+
+def _read_limited(value, limits):
+    if hasattr(value, 'read'):
+        return limits.read(value)
+    limits.check_size(value)
+    return value
+
+
 class PyYamlImplementation(YamlImplementation):
     module_name = 'yaml'
 
@@ -33,7 +103,13 @@ class PyYamlImplementation(YamlImplementation):
         if self.is_available():
             self._dumper = self._build_dumper()
             self._strdate_loader = self._build_strdate_loader()
-            self._nativedate_loader = self._build_nativedate_loader()
+            self._nativedate_loaders = {
+                datetime_keys: self._build_nativedate_loader(
+                    datetime_keys=datetime_keys,
+                )
+                for datetime_keys in (True, False)
+            }
+            self._limited_loaders = {}
 
     def serialize(self, value, pretty=False):
         opts = {
@@ -43,13 +119,74 @@ class PyYamlImplementation(YamlImplementation):
         }
         return self._module.dump(value, **opts).rstrip()
 
-    def deserialize(self, value, native_datetimes=True):
+    def deserialize(
+            self,
+            value,
+            native_datetimes=True,
+            native_datetime_keys=True,
+            limits=None):
+        loader = self._get_loader(
+            native_datetimes,
+            native_datetime_keys,
+            limits,
+        )
+        if limits is not None:
+            value = _read_limited(value, limits)
+
+        return self._module.load(value, Loader=loader)
+
+    def deserialize_all(
+            self,
+            value,
+            native_datetimes=True,
+            native_datetime_keys=True,
+            limits=None):
+        loader = self._get_loader(
+            native_datetimes,
+            native_datetime_keys,
+            limits,
+        )
+        if limits is not None:
+            value = _read_limited(value, limits)
+
+        return self._module.load_all(value, Loader=loader)
+
+    def _get_loader(self, native_datetimes, native_datetime_keys, limits):
         if native_datetimes:
-            loader = self._nativedate_loader
+            loader = self._nativedate_loaders[native_datetime_keys]
         else:
             loader = self._strdate_loader
+        if limits is None:
+            return loader
+
+        limited = self._limited_loaders.get(loader)
+        if limited is None:
+            limited = self._limited_loaders[loader] = \
+                self._build_limited_loader(loader)
+        events = self._module.events
+
+        def build_loader(stream):
+            instance = limited(stream)
+            instance.limiter = _ComposeLimiter(limits, events)
+            return instance
+
+        return build_loader
+
+    def _build_limited_loader(self, base_loader):
+        # pylint: disable=no-self-use
+
+        class LimitedYamlLoader(base_loader):
+            limiter = None
+
+            def compose_node(self, parent, index):
+                return self.limiter.compose(
+                    super().compose_node,
+                    self.peek_event(),
+                    parent,
+                    index,
+                )
 
-        return self._module.load(value, Loader=loader)
+        return LimitedYamlLoader
 
     def _build_dumper(self, base_dumper=None):  # noqa: complex
         yaml = self._module
@@ -59,15 +196,24 @@ class PyYamlImplementation(YamlImplementation):
             def list_representer(self, data):
                 return self.represent_sequence(
                     'tag:yaml.org,2002:seq',
-                    list(data),
+                    data,
                 )
 
             def dict_representer(self, data):
                 return self.represent_mapping(
                     yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                    list(data.items()),
+                    data.items(),
+                )
+
+            def namedtuple_representer(self, data):
+                return self.represent_mapping(
+                    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+                    zip(data._fields, data),
                 )
 
+            def fields_representer(self, data):
+                return self.dict_representer(get_fields(data))
+
             def decimal_representer(self, data):
                 return self.represent_scalar(
                     'tag:yaml.org,2002:float',
@@ -101,14 +247,40 @@ class PyYamlImplementation(YamlImplementation):
             def enum_representer(self, data):
                 return self.represent_data(data.value)
 
+            def numpy_representer(self, data):
+                return self.represent_data(numpy_to_python(data))
+
             def unknown_representer(self, data):
+                representer = self.find_representer(data)
+                if representer is None:
+                    return self.represent_undefined(data)
+                return self.cache_representer(data, representer)
+
+            def find_representer(self, data):  # noqa: no-self-use
                 if isinstance(data, tuple) and hasattr(data, '_fields'):
-                    return self.dict_representer(data._asdict())
+                    return BasicYamlDumper.namedtuple_representer
                 if isinstance(data, UserDict):
-                    return self.dict_representer(data)
+                    return BasicYamlDumper.dict_representer
                 if isinstance(data, UserList):
-                    return self.list_representer(data)
-                return self.represent_undefined(data)
+                    return BasicYamlDumper.list_representer
+                if is_numpy(data):
+                    return BasicYamlDumper.numpy_representer
+                if get_fields(data) is not None:
+                    return BasicYamlDumper.fields_representer
+                return None
+
+            def cache_representer(self, data, representer):
+                # Register the representer against the exact type, so later
+                # instances skip the multi-representer and isinstance()
+                # searches.
+                self.add_representer(type(data), representer)
+                return representer(self, data)
+
+        def cached(representer):
+            return lambda self, data: self.cache_representer(
+                data,
+                representer,
+            )
 
         representers = (
             (decimal.Decimal, BasicYamlDumper.decimal_representer),
@@ -131,7 +303,7 @@ class PyYamlImplementation(YamlImplementation):
 
         BasicYamlDumper.add_multi_representer(
             enum.Enum,
-            BasicYamlDumper.enum_representer,
+            cached(BasicYamlDumper.enum_representer),
         )
 
         return BasicYamlDumper
@@ -153,9 +325,29 @@ class PyYamlImplementation(YamlImplementation):
 
         return StringedDatesYamlLoader
 
-    def _build_nativedate_loader(self, base_loader=None):
+    def _build_datelike_resolver(self, base_resolver, datelike_tag):
+        # pylint: disable=no-self-use
+
+        class DatelikeYamlResolver(base_resolver):
+            # Only scalars that have the shape of a date/time are handed to
+            # the date constructor; everything else keeps its usual tag.
+
+            def resolve(self, kind, value, implicit):
+                tag = super().resolve(kind, value, implicit)
+                if value is not None \
+                        and RE_DATELIKE.match(value) \
+                        and tag in (STR_TAG, TIMESTAMP_TAG):
+                    return datelike_tag
+                return tag
+
+        return DatelikeYamlResolver
+
+    def _build_nativedate_loader(self, base_loader=None, datetime_keys=True):
         yaml = self._module
-        base_loader = base_loader or yaml.SafeLoader
+        base_loader = base_loader or self._build_datelike_resolver(
+            yaml.SafeLoader,
+            DATELIKE_TAG,
+        )
 
         class NativeDatesYamlLoader(base_loader):
             # pylint: disable=no-self-use
@@ -163,15 +355,20 @@ class PyYamlImplementation(YamlImplementation):
             def timestamp_constructor(self, node):
                 return get_date_or_string(node.value)
 
-            def str_constructor(self, node):
-                return get_date_or_string(node.value)
+            def construct_mapping(self, node, deep=False):
+                if not datetime_keys:
+                    self.flatten_mapping(node)
+                    for key_node, _ in node.value:
+                        if key_node.tag in (DATELIKE_TAG, TIMESTAMP_TAG):
+                            key_node.tag = STR_TAG
+                return super().construct_mapping(node, deep=deep)
 
         NativeDatesYamlLoader.add_constructor(
-            'tag:yaml.org,2002:str',
-            NativeDatesYamlLoader.str_constructor,
+            DATELIKE_TAG,
+            NativeDatesYamlLoader.timestamp_constructor,
         )
         NativeDatesYamlLoader.add_constructor(
-            'tag:yaml.org,2002:timestamp',
+            TIMESTAMP_TAG,
             NativeDatesYamlLoader.timestamp_constructor,
         )
 
@@ -185,6 +382,12 @@ class RuamelYamlImplementation(PyYamlImplementation):
         super().__init__()
 
         self._new_api = self._module and (self._module.version_info >= (0, 15))
+        if self._new_api:
+            self._datelike_resolver = self._build_datelike_resolver(
+                self._module.resolver.VersionedResolver,
+                self._module.tag.Tag(suffix=DATELIKE_TAG),
+            )
+            self._limited_composer = self._build_limited_composer()
 
     def _build_dumper(self, base_dumper=None):  # noqa: complex
         return super()._build_dumper(
@@ -196,9 +399,10 @@ class RuamelYamlImplementation(PyYamlImplementation):
             base_loader=self._module.constructor.SafeConstructor,
         )
 
-    def _build_nativedate_loader(self, base_loader=None):
+    def _build_nativedate_loader(self, base_loader=None, datetime_keys=True):
         return super()._build_nativedate_loader(
             base_loader=self._module.constructor.SafeConstructor,
+            datetime_keys=datetime_keys,
         )
 
     def serialize(self, value, pretty=False):
@@ -218,18 +422,86 @@ class RuamelYamlImplementation(PyYamlImplementation):
         }
         return self._module.dump(value, **opts).rstrip()
 
-    def deserialize(self, value, native_datetimes=True):
+    def deserialize(
+            self,
+            value,
+            native_datetimes=True,
+            native_datetime_keys=True,
+            limits=None):
+        if not self._new_api:
+            return super().deserialize(
+                value,
+                native_datetimes=native_datetimes,
+                native_datetime_keys=native_datetime_keys,
+                limits=limits,
+            )
+
+        if limits is not None:
+            value = _read_limited(value, limits)
+        return self._get_loader_yaml(
+            native_datetimes,
+            native_datetime_keys,
+            limits,
+        ).load(value)
+
+    def deserialize_all(
+            self,
+            value,
+            native_datetimes=True,
+            native_datetime_keys=True,
+            limits=None):
+        if not self._new_api:
+            return super().deserialize_all(
+                value,
+                native_datetimes=native_datetimes,
+                native_datetime_keys=native_datetime_keys,
+                limits=limits,
+            )
+
+        if limits is not None:
+            value = _read_limited(value, limits)
+        return self._get_loader_yaml(
+            native_datetimes,
+            native_datetime_keys,
+            limits,
+        ).load_all(value)
+
+    def _get_loader_yaml(self, native_datetimes, native_datetime_keys, limits):
+        yaml = self._module.YAML(typ='safe')
         if native_datetimes:
-            loader = self._nativedate_loader
+            yaml.Constructor = self._nativedate_loaders[native_datetime_keys]
+            yaml.Resolver = self._datelike_resolver
         else:
-            loader = self._strdate_loader
-
-        if self._new_api:
-            yaml = self._module.YAML(typ='safe')
-            yaml.Constructor = loader
-            return yaml.load(value)
+            yaml.Constructor = self._strdate_loader
+
+        if limits is not None:
+            composer = self._limited_composer
+            events = self._module.events
+
+            def build_composer(loader=None):
+                instance = composer(loader=loader)
+                instance.limiter = _ComposeLimiter(limits, events)
+                return instance
+
+            yaml.Composer = build_composer
+            # The C parser composes the nodes itself, which would bypass the
+            # limits.
+            yaml.Parser = self._module.parser.Parser
+        return yaml
+
+    def _build_limited_composer(self):
+        class LimitedYamlComposer(self._module.composer.Composer):
+            limiter = None
+
+            def compose_node(self, parent, index):
+                return self.limiter.compose(
+                    super().compose_node,
+                    self.parser.peek_event(),
+                    parent,
+                    index,
+                )
 
-        return self._module.load(value, Loader=loader)
+        return LimitedYamlComposer
 
 
 IMPLEMENTATIONS = ImplementationRegistry()
@@ -237,7 +509,104 @@ IMPLEMENTATIONS.register('yaml', PyYamlImplementation)
 IMPLEMENTATIONS.register('ruamel.yaml', RuamelYamlImplementation)
 
 
-def to_yaml(value, pretty=False, pkg=None):
+# Characters that YAML won't accept in a double-quoted scalar as JSON writes
+# them (non-printables, line breaks that YAML folds, and anything that a JSON
+# package may escape as a surrogate pair).
+RE_YAML_UNSAFE = re.compile(
+    '[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff'
+    '\U00010000-\U0010ffff]',
+)
+
+
+RE_JSON_START = re.compile(r'\s*[\[{]')
+
+
+def _from_json(value, native_datetimes, native_datetime_keys, limits):
+    if not isinstance(value, str) or not RE_JSON_START.match(value):
+        return False, None
+
+    impl = JSON_IMPLEMENTATIONS.get_preferred(FAST_JSON_PACKAGES)
+    try:
+        result = impl.deserialize(
+            value,
+            native_datetimes=False,
+            limits=limits,
+        )
+    except LimitExceededError:
+        raise
+    except ValueError:
+        return False, None
+
+    if native_datetimes:
+        result = convert_decoded(
+            result,
+            native_datetime_keys=native_datetime_keys,
+        )
+    return True, result
+
+
+def _is_flow_float(value):
+    # Only floats that every JSON package writes in plain decimal notation,
+    # as YAML 1.1 requires a decimal point.
+    return value == 0 or 1e-4 <= abs(value) < 1e15
+
+
+# The longest a mapping key can be written (including its quotes) and still
+# be read back as an implicit key.
+MAX_FLOW_KEY_LENGTH = 1024
+
+# Keys no longer than this can't be written any longer than the above, as
+# JSON writes each character as at most six.
+MAX_UNCHECKED_KEY_LENGTH = (MAX_FLOW_KEY_LENGTH - 2) // 6
+
+
+def _is_json_compatible(value, impl):  # noqa: complex
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        typ = type(value)
+        if typ is dict:
+            for key in value:
+                if type(key) is not str or RE_YAML_UNSAFE.search(key):
+                    return False
+                if len(key) > MAX_UNCHECKED_KEY_LENGTH \
+                        and len(impl.serialize(key)) > MAX_FLOW_KEY_LENGTH:
+                    return False
+            stack.extend(value.values())
+        elif typ is list:
+            stack.extend(value)
+        elif typ is str:
+            if RE_YAML_UNSAFE.search(value):
+                return False
+        elif typ is float:
+            if not _is_flow_float(value):
+                return False
+        elif typ not in (int, bool, type(None)):
+            return False
+    return True
+
+
+def _to_flow_json(value):
+    impl = JSON_IMPLEMENTATIONS.get_preferred(FAST_JSON_PACKAGES)
+    if not _is_json_compatible(value, impl):
+        return None
+
+    try:
+        return impl.serialize(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+@recursion_guard
+def to_yaml(
+        value,
+        pretty=False,
+        pkg=None,
+        encoder=None,
+        fast_flow=False,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None):
     """
     Serializes the given value to YAML.
 
@@ -250,16 +619,268 @@ def to_yaml(value, pretty=False, pkg=None):
         the YAML package to use for serialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param encoder:
+        a function generated by ``compile_encoder()`` to use to prepare the
+        value (or each element of the value, if it is a list or tuple) before
+        it is serialized
+    :type encoder: function
+    :param fast_flow:
+        whether or not to use a JSON package to produce the output when
+        ``pretty`` is ``False`` and the value consists only of dicts, lists,
+        strings, numbers, booleans, and ``None`` (JSON is valid flow-style
+        YAML, and JSON packages are much faster); other values are serialized
+        as usual; if not specified, defaults to ``False``
+    :type fast_flow: bool
+    :param max_bytes:
+        the maximum size of the output, in bytes; if not specified, there is
+        no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the value, checked before it is
+        serialized; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (containers, mapping keys, and scalars)
+        in the value, checked before it is serialized; if not specified,
+        there is no limit
+    :type max_nodes: int
+    :raises LimitExceededError: if the value exceeds one of the limits
     :rtype: str
     """
 
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.serialize(value, pretty=pretty)
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    if encoder is not None:
+        check_encoder(encoder, 'yaml')
+        value = apply_encoder(value, encoder)
+    if limits is not None:
+        limits.check_structure(value)
+
+    result = None
+    if fast_flow and not pretty:
+        result = _to_flow_json(value)
+    if result is None:
+        result = impl.serialize(value, pretty=pretty)
+
+    if limits is not None:
+        limits.check_size(result)
+    return result
+
+
+@recursion_guard
+def from_yaml(
+        value,
+        native_datetimes=True,
+        pkg=None,
+        into=None,
+        try_json=False,
+        native_datetime_keys=True,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None,
+        max_alias_expansions=None):
+    """
+    Deserializes the given value from YAML.
+
+    :param value: the value to deserialize
+    :type value: str
+    :param native_datetimes:
+        whether or not strings that look like dates/times should be
+        automatically cast to the native objects, or left as strings; if not
+        specified, defaults to ``True``
+    :type native_datetimes: bool
+    :param pkg:
+        the YAML package to use for deserialization; if not specified, uses the
+        first supported package found in the environment
+    :type pkg: str
+    :param into:
+        the type to decode the value into, such as a dataclass; strings are
+        only converted to dates/times where the type calls for them, so
+        ``native_datetimes`` is ignored
+    :type into: type
+    :param try_json:
+        whether or not to first try parsing documents that look like JSON (an
+        object or array) with the fastest available JSON package, falling
+        back to the YAML package if that fails; if not specified, defaults to
+        ``False``
+    :type try_json: bool
+    :param native_datetime_keys:
+        whether or not mapping keys that look like dates/times should also be
+        cast to the native objects when ``native_datetimes`` is enabled; if not
+        specified, defaults to ``True``
+    :type native_datetime_keys: bool
+    :param max_bytes:
+        the maximum size of the value, in bytes; checked before it is parsed
+        (streams are read no further than this); if not specified, there is
+        no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of the value; checked as it is parsed; if
+        not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (collections, mapping keys, and scalars)
+        in the value, counting everything under an alias each time the alias
+        is used; checked as it is parsed; if not specified, there is no limit
+    :type max_nodes: int
+    :param max_alias_expansions:
+        the maximum number of nodes that aliases may stand for in total
+        (an alias to a list of ten scalars counts as eleven); checked as it
+        is parsed, so "billion laughs" documents are rejected early; if not
+        specified, there is no limit
+    :type max_alias_expansions: int
+    :raises LimitExceededError: if the value exceeds one of the limits
+    """
+
+    impl = IMPLEMENTATIONS.get(pkg)
+    if into is not None:
+        native_datetimes = False
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+        max_alias_expansions=max_alias_expansions,
+    )
+
+    parsed = False
+    if try_json:
+        parsed, result = _from_json(
+            value,
+            native_datetimes,
+            native_datetime_keys,
+            limits,
+        )
+    if not parsed:
+        result = impl.deserialize(
+            value,
+            native_datetimes=native_datetimes,
+            native_datetime_keys=native_datetime_keys,
+            limits=limits,
+        )
 
+    if into is not None:
+        return build_decoder(into)(result)
+    return result
 
-def from_yaml(value, native_datetimes=True, pkg=None):
+
+# Document markers, which can only appear at the start of a line (and never
+# inside of a scalar).
+RE_YAML_DOCUMENT_MARKER = re.compile(r'^(---|\.\.\.)(?=[ \t\r\n]|\Z)', re.M)
+
+# A line that starts a document's content (rather than being blank, a
+# comment, or a directive).
+RE_YAML_DOCUMENT_CONTENT = re.compile(r'^[ \t]*[^\s#%]', re.M)
+
+# Directives (and any comments among them) that lead up to a document.
+RE_YAML_DIRECTIVES = re.compile(
+    r'^%.*\n(?:(?:%.*|[ \t]*(?:#.*)?)\n)*\Z',
+    re.M,
+)
+
+# How many batches of documents to give each worker, so that uneven batches
+# even out.
+BATCHES_PER_WORKER = 4
+
+
+def _split_yaml_documents(value):
+    # Splits a YAML stream into pieces holding one document each, keeping any
+    # directives with the document that follows them. Returns None if there
+    # are directives after a document that wasn't closed with "...", or a
+    # "..." that closes no document, which the packages reject (or don't
+    # agree on), but which would be accepted once split apart.
+    pieces = []
+    start = 0
+    for match in RE_YAML_DOCUMENT_MARKER.finditer(value):
+        if match.group(1) == '---':
+            end = match.start()
+            directives = RE_YAML_DIRECTIVES.search(value[start:end])
+            if directives:
+                end = start + directives.start()
+            if RE_YAML_DOCUMENT_CONTENT.search(value, start, end):
+                if directives:
+                    return None
+                pieces.append(value[start:end])
+                start = end
+        else:
+            end = value.find('\n', match.end())
+            end = len(value) if end < 0 else end + 1
+            if not RE_YAML_DOCUMENT_CONTENT.search(
+                    value,
+                    start,
+                    match.start()):
+                return None
+            pieces.append(value[start:end])
+            start = end
+    pieces.append(value[start:])
+    return pieces
+
+
+def _batch_yaml_documents(pieces, count):
+    batch_size = max(1, sum(map(len, pieces)) // count)
+    batches = [[]]
+    size = 0
+    for piece in pieces:
+        if size >= batch_size:
+            batches.append([])
+            size = 0
+        batches[-1].append(piece)
+        size += len(piece)
+    return batches
+
+
+_WORKER_STATE = {}
+
+
+def _init_yaml_worker(pkg, native_datetimes, native_datetime_keys, limits):
+    _WORKER_STATE['impl'] = IMPLEMENTATIONS.get(pkg)
+    _WORKER_STATE['native_datetimes'] = native_datetimes
+    _WORKER_STATE['native_datetime_keys'] = native_datetime_keys
+    _WORKER_STATE['limits'] = limits
+
+
+def _parse_yaml_documents(pieces):
+    impl = _WORKER_STATE['impl']
+
+    # Each batch gets its own count of nodes, which are totalled up by the
+    # parent.
+    limits = _WORKER_STATE['limits']
+    if limits is not None:
+        limits = Limits(
+            max_depth=limits.max_depth,
+            max_nodes=limits.max_nodes,
+            max_alias_expansions=limits.max_alias_expansions,
+        )
+
+    documents = []
+    for piece in pieces:
+        documents.extend(impl.deserialize_all(
+            piece,
+            native_datetimes=_WORKER_STATE['native_datetimes'],
+            native_datetime_keys=_WORKER_STATE['native_datetime_keys'],
+            limits=limits,
+        ))
+    if limits is None:
+        return documents, 0, 0
+    return documents, limits.nodes, limits.alias_expansions
+
+
+@recursion_guard
+def from_yaml_all(
+        value,
+        native_datetimes=True,
+        pkg=None,
+        workers=None,
+        native_datetime_keys=True,
+        max_bytes=None,
+        max_depth=None,
+        max_nodes=None,
+        max_alias_expansions=None):
     """
-    Deserializes the given value from YAML.
+    Deserializes all of the documents in the given YAML stream.
 
     :param value: the value to deserialize
     :type value: str
@@ -272,7 +893,96 @@ def from_yaml(value, native_datetimes=True, pkg=None):
         the YAML package to use for deserialization; if not specified, uses the
         first supported package found in the environment
     :type pkg: str
+    :param workers:
+        the number of processes to use to deserialize the documents; the
+        stream is split up at its document markers and the pieces are
+        deserialized in separate processes; if not specified, the documents
+        are deserialized in the current process
+    :type workers: int
+    :param native_datetime_keys:
+        whether or not mapping keys that look like dates/times should also be
+        cast to the native objects when ``native_datetimes`` is enabled; if not
+        specified, defaults to ``True``
+    :type native_datetime_keys: bool
+    :param max_bytes:
+        the maximum size of the value, in bytes; checked before it is parsed
+        (streams are read no further than this); if not specified, there is
+        no limit
+    :type max_bytes: int
+    :param max_depth:
+        the maximum nesting depth of each document; checked as it is
+        parsed; if not specified, there is no limit
+    :type max_depth: int
+    :param max_nodes:
+        the maximum number of nodes (collections, mapping keys, and scalars)
+        in all of the documents, counting everything under an alias each time
+        the alias is used; checked as it is parsed; if not specified, there
+        is no limit
+    :type max_nodes: int
+    :param max_alias_expansions:
+        the maximum number of nodes that aliases may stand for in total
+        (an alias to a list of ten scalars counts as eleven); checked as it
+        is parsed, so "billion laughs" documents are rejected early; if not
+        specified, there is no limit
+    :type max_alias_expansions: int
+    :raises LimitExceededError: if the value exceeds one of the limits
+    :rtype: list
     """
 
     impl = IMPLEMENTATIONS.get(pkg)
-    return impl.deserialize(value, native_datetimes=native_datetimes)
+    if workers is not None and workers < 1:
+        raise ValueError('workers must be at least 1')
+    limits = Limits.build(
+        max_bytes=max_bytes,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+        max_alias_expansions=max_alias_expansions,
+    )
+
+    if not workers or workers == 1:
+        return list(impl.deserialize_all(
+            value,
+            native_datetimes=native_datetimes,
+            native_datetime_keys=native_datetime_keys,
+            limits=limits,
+        ))
+
+    # This is slow to import, and only needed here.
+    from concurrent.futures import ProcessPoolExecutor
+
+    if hasattr(value, 'read'):
+        value = value.read() if limits is None else limits.read(value)
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    if limits is not None:
+        limits.check_size(value)
+
+    pieces = _split_yaml_documents(value)
+    if pieces is None:
+        # Let the package deal with the misplaced markers or directives.
+        return list(impl.deserialize_all(
+            value,
+            native_datetimes=native_datetimes,
+            native_datetime_keys=native_datetime_keys,
+            limits=limits,
+        ))
+
+    batches = _batch_yaml_documents(pieces, workers * BATCHES_PER_WORKER)
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_yaml_worker,
+            initargs=(
+                pkg,
+                native_datetimes,
+                native_datetime_keys,
+                limits,
+            )) as executor:
+        documents = []
+        for batch, nodes, alias_expansions in executor.map(
+                _parse_yaml_documents,
+                batches):
+            if limits is not None:
+                limits.add_nodes(nodes)
+                limits.add_alias_expansion(alias_expansions)
+            documents.extend(batch)
+        return documents
@@ -1,8 +1,12 @@
 from collections import namedtuple, OrderedDict, defaultdict, UserDict, UserList, UserString
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from enum import Enum
 from datetime import date, time, datetime
 from decimal import Decimal
 from fractions import Fraction
+from ipaddress import IPv4Address
+from pathlib import PurePosixPath
 from pytz import timezone
 from uuid import uuid4
 
@@ -30,6 +34,40 @@ class CustomEnum(Enum):
 CustomNamedTuple = namedtuple('CustomNamedTuple', ['foo'])
 
 
+@dataclass
+class CustomDataclass:
+    foo: int
+    bar: str = 'baz'
+
+
+@dataclass
+class TypedChild:
+    name: str
+    born: date
+    at: Optional[time] = None
+
+
+@dataclass
+class TypedParent:
+    id: int
+    created: datetime
+    label: str
+    children: List[TypedChild]
+    score: Optional[float] = None
+    tags: Dict[str, int] = field(default_factory=dict)
+    parent: Optional['TypedParent'] = None
+
+
+class CustomSlots:
+    __slots__ = ('foo', 'bar', '_secret')
+
+    def __init__(self, foo, bar=None):
+        self.foo = foo
+        self._secret = 'hidden'
+        if bar is not None:
+            self.bar = bar
+
+
 TZ_EST = timezone('America/New_York')
 TZ_UTC = timezone('UTC')
 
@@ -0,0 +1,144 @@
+import bz2
+import gzip
+import lzma
+
+from io import BytesIO
+
+from .common import *
+from basicserial import (
+    open_compressed,
+    iter_file,
+    load_file,
+    dump_file,
+    AVAILABLE_JSON_PACKAGES,
+    AVAILABLE_TOML_PACKAGES,
+    AVAILABLE_YAML_PACKAGES,
+)
+
+
+COMPRESSIONS = (
+    ('', None),
+    ('.gz', gzip.decompress),
+    ('.bz2', bz2.decompress),
+    ('.xz', lzma.decompress),
+)
+
+RECORDS = [
+    {'foo': idx, 'when': date(2018, 5, idx + 1), 'name': 'bär'}
+    for idx in range(20)
+]
+
+
+@pytest.mark.parametrize('extension,decompress', COMPRESSIONS)
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_json(extension, decompress, pkg, tmp_path):
+    path = tmp_path / ('records.json' + extension)
+
+    dump_file(RECORDS, path, pkg=pkg)
+    if decompress:
+        assert decompress(path.read_bytes()).startswith(b'[')
+    assert load_file(path, pkg=pkg) == RECORDS
+    assert list(iter_file(path, pkg=pkg, array_items=True)) == RECORDS
+    assert load_file(str(path), format='json', pkg=pkg, native_datetimes=False)[0] \
+        == {'foo': 0, 'when': '2018-05-01', 'name': 'bär'}
+
+    dump_file(iter(RECORDS), path, pkg=pkg)
+    assert load_file(path, pkg=pkg) == RECORDS
+
+    dump_file({'foo': RECORDS}, path, pretty=True, pkg=pkg)
+    assert load_file(path, pkg=pkg) == {'foo': RECORDS}
+
+    dump_file(CustomNamedTuple(foo=1), path, pkg=pkg)
+    assert load_file(path, pkg=pkg) == {'foo': 1}
+    dump_file((1, 2), path, pkg=pkg)
+    assert load_file(path, pkg=pkg) == [1, 2]
+
+
+@pytest.mark.parametrize('extension,decompress', COMPRESSIONS)
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_jsonl(extension, decompress, pkg, tmp_path):
+    path = tmp_path / ('records.ndjson' + extension)
+
+    dump_file(RECORDS, path, pkg=pkg)
+    if decompress:
+        assert decompress(path.read_bytes()).count(b'\n') == len(RECORDS)
+    assert load_file(path, pkg=pkg) == RECORDS
+    assert list(iter_file(path, pkg=pkg)) == RECORDS
+
+
+@pytest.mark.parametrize('extension,decompress', COMPRESSIONS)
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_yaml(extension, decompress, pkg, tmp_path):
+    path = tmp_path / ('records.yml' + extension)
+
+    dump_file(RECORDS, path, pkg=pkg)
+    assert load_file(path, pkg=pkg) == RECORDS
+
+    path.write_bytes(gzip.compress(b'foo: 1\n---\nfoo: 2018-05-22\n'))
+    assert list(iter_file(path, format='yaml', pkg=pkg)) \
+        == [{'foo': 1}, {'foo': date(2018, 5, 22)}]
+    with pytest.raises(ValueError):
+        load_file(path, format='yaml', pkg=pkg)
+
+
+@pytest.mark.parametrize('extension,decompress', COMPRESSIONS)
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_toml(extension, decompress, pkg, tmp_path):
+    path = tmp_path / ('records.toml' + extension)
+
+    value = {'foo': 'bär', 'bar': {'baz': [1, 2, 3]}}
+    dump_file(value, path, pkg=pkg)
+    assert load_file(path, pkg=pkg) == value
+
+
+def test_streams():
+    stream = BytesIO()
+    dump_file(RECORDS, stream, format='jsonl', compression='xz')
+    assert not stream.closed
+    assert lzma.decompress(stream.getvalue()).count(b'\n') == len(RECORDS)
+
+    stream.seek(0)
+    assert load_file(stream, format='jsonl') == RECORDS
+    assert not stream.closed
+
+    stream = BytesIO()
+    dump_file(RECORDS, stream, format='json')
+    stream.seek(0)
+    assert load_file(stream, format='json') == RECORDS
+
+    stream = BytesIO(bz2.compress(b'foo: 1\n'))
+    assert load_file(stream, format='yaml') == {'foo': 1}
+    assert not stream.closed
+
+    with open_compressed(BytesIO(gzip.compress(b'hello'))) as stream:
+        assert stream.read() == b'hello'
+
+
+def test_compression_override(tmp_path):
+    path = tmp_path / 'records.json'
+    dump_file(RECORDS, path, compression='gzip')
+    assert gzip.decompress(path.read_bytes()).startswith(b'[')
+    assert load_file(path) == RECORDS
+
+    path = tmp_path / 'records.json.gz'
+    dump_file(RECORDS, path, compression=False)
+    assert path.read_bytes().startswith(b'[')
+    assert load_file(path) == RECORDS
+
+
+def test_bad_arguments(tmp_path):
+    path = tmp_path / 'records.json'
+    path.write_text('[1] [2]')
+
+    with pytest.raises(ValueError):
+        load_file(path)
+    with pytest.raises(ValueError):
+        load_file(path, format='xml')
+    with pytest.raises(ValueError):
+        load_file(path, compression='zip')
+    with pytest.raises(ValueError):
+        load_file(tmp_path / 'records.dat')
+    with pytest.raises(ValueError):
+        dump_file([], tmp_path / 'records.gz')
+    with pytest.raises(ValueError):
+        open_compressed(path, mode='r')
@@ -0,0 +1,76 @@
+import hashlib
+import json
+
+from .common import *
+from basicserial import fingerprint
+from basicserial.hashing import BATCH_SIZE
+
+
+def canonical_sha256(value):
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+@pytest.mark.parametrize('value', (
+    None,
+    'bär',
+    123,
+    1.5,
+    [],
+    {},
+    [1, 'two', None, True, 4.5],
+    {'foo': 1, 'bar': [1, {'baz': None, 'aaa': 'ü'}], 'empty': {}},
+    [{'foo': idx, 'bar': [idx] * 3} for idx in range(BATCH_SIZE * 3)],
+    list(range(BATCH_SIZE * 2 + 5)),
+    {'k%05d' % idx: idx for idx in range(BATCH_SIZE * 2 + 5)},
+    {'k%05d' % idx: [idx] for idx in range(BATCH_SIZE + 5)},
+    [[[['deep']]], [[], [{}]]],
+))
+def test_fingerprint(value):
+    assert fingerprint(value) == canonical_sha256(value)
+
+
+def test_fingerprint_equivalent():
+    pairs = [('foo', 1), ('bar', [date(2018, 5, 22)]), ('baz', {'b': 2, 'a': 1})]
+    expected = fingerprint(dict(pairs))
+    assert expected == canonical_sha256({
+        'foo': 1,
+        'bar': ['2018-05-22'],
+        'baz': {'a': 1, 'b': 2},
+    })
+
+    assert fingerprint(dict(reversed(pairs))) == expected
+    assert fingerprint(OrderedDict(pairs)) == expected
+    assert fingerprint(CustomUserDict(reversed(pairs))) == expected
+    assert fingerprint({'foo': 1, 'bar': (date(2018, 5, 22),), 'baz': OrderedDict([('b', 2), ('a', 1)])}) == expected
+    assert fingerprint({'foo': 1, 'bar': ['2018-05-22'], 'baz': {'a': 2}}) != expected
+
+
+def test_fingerprint_keys():
+    value = {10: 'a', 2: 'b', True: 'c', date(2018, 5, 22): 'd', 'x': 'e'}
+    assert fingerprint(value) == canonical_sha256({
+        '10': 'a', '2': 'b', 'true': 'c', '2018-05-22': 'd', 'x': 'e',
+    })
+    assert fingerprint({idx: [idx] for idx in range(12)}) \
+        == canonical_sha256({str(idx): [idx] for idx in range(12)})
+
+
+def test_fingerprint_duplicate_keys():
+    with pytest.raises(ValueError, match='Duplicate key "2018-05-22"'):
+        fingerprint({date(2018, 5, 22): 1, '2018-05-22': 2})
+    with pytest.raises(ValueError, match='Duplicate key "1"'):
+        fingerprint({'foo': [{1: 'a', '1': 'b'}]})
+    with pytest.raises(ValueError, match='Duplicate key "true"'):
+        fingerprint({True: 'a', 'true': 'b', 'big': list(range(BATCH_SIZE * 2))})
+
+
+def test_fingerprint_algorithm():
+    value = {'foo': [1, 2, 3]}
+    encoded = b'{"foo":[1,2,3]}'
+    assert fingerprint(value, algorithm='md5') == hashlib.md5(encoded).hexdigest()
+    assert fingerprint(value, algorithm='blake2b') == hashlib.blake2b(encoded).hexdigest()
+
+    with pytest.raises(ValueError):
+        fingerprint(value, algorithm='nope')
+    with pytest.raises(ValueError):
+        fingerprint(value, format='yaml')
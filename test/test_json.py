@@ -1,8 +1,12 @@
+import os
 import sys
 
+from types import MappingProxyType
+
 from .common import *
 
-from basicserial import to_json, from_json, AVAILABLE_JSON_PACKAGES
+from basicserial import to_json, iter_to_json, from_json, from_jsonl, compile_encoder, JsonFeedParser, JsonlIndex, LimitExceededError, EncodeMemo, InternTable, AVAILABLE_JSON_PACKAGES
+from basicserial.util import Normalizer
 
 
 SIMPLE_TYPES = pkg_parameterize(
@@ -227,3 +231,707 @@ def test_parse_no_datetime(pkg):
 def test_parse_some_scalars_no_datetime(pkg):
     assert from_json('"2018-05-22"', native_datetimes=False, pkg=pkg) == '2018-05-22'
     assert from_json('123', native_datetimes=False, pkg=pkg) == 123
+
+
+RECORDS = """[
+    {"status": "active", "created": "2018-05-22", "tags": ["a", "b"]},
+    {"status": "active", "created": "2018-05-23", "tags": ["a"]}
+]"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_intern_strings(pkg):
+    parsed = from_json(RECORDS, intern_strings=True, pkg=pkg)
+    assert parsed[0]['created'] == date(2018, 5, 22)
+    assert parsed[0]['status'] == 'active'
+    assert parsed[0]['status'] is parsed[1]['status']
+    assert parsed[0]['tags'][0] is parsed[1]['tags'][0]
+    key0 = [key for key in parsed[0] if key == 'status'][0]
+    key1 = [key for key in parsed[1] if key == 'status'][0]
+    assert key0 is key1
+
+
+def test_parse_intern_strings_shared_table():
+    table = InternTable(max_size=2, max_length=6)
+    first = from_json('["active", "active", "a-very-long-value"]', intern_strings=table)
+    second = from_json('["active", "x", "y"]', intern_strings=table)
+    assert first[0] is first[1] is second[0]
+    assert first == ['active', 'active', 'a-very-long-value']
+    assert second == ['active', 'x', 'y']
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_frozen(pkg):
+    parsed = from_json(RECORDS, frozen=True, pkg=pkg)
+    assert isinstance(parsed, tuple)
+    assert isinstance(parsed[0], MappingProxyType)
+    assert parsed[0]['tags'] == ('a', 'b')
+    assert parsed[1]['created'] == date(2018, 5, 23)
+    with pytest.raises(TypeError):
+        parsed[0]['status'] = 'inactive'
+
+    parsed = from_json(RECORDS, frozen=True, native_datetimes=False, pkg=pkg)
+    assert parsed[1]['created'] == '2018-05-23'
+
+
+COLUMN_RECORDS = """[
+    {"id": 1, "score": 1.5, "ok": true, "name": "foo", "created": "2018-05-22", "at": "12:34:56"},
+    {"id": 2, "score": 2, "ok": false, "name": "bar", "created": "2018-05-23", "at": "12:34:56.000789"},
+    {"id": 3, "score": 3.25, "ok": true, "name": "2018-05-22", "created": "2018-05-99", "extra": null}
+]"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_columns(pkg):
+    parsed = from_json(COLUMN_RECORDS, layout='columns', pkg=pkg)
+    assert list(parsed.keys()) == ['id', 'score', 'ok', 'name', 'created', 'at', 'extra']
+    assert list(parsed['id']) == [1, 2, 3]
+    assert list(parsed['score']) == [1.5, 2.0, 3.25]
+    assert [bool(x) for x in parsed['ok']] == [True, False, True]
+    assert parsed['name'] == ['foo', 'bar', date(2018, 5, 22)]
+    assert parsed['created'] == [date(2018, 5, 22), date(2018, 5, 23), '2018-05-99']
+    assert parsed['at'] == [time(12, 34, 56), time(12, 34, 56, 789), None]
+    assert parsed['extra'] == [None, None, None]
+
+    parsed = from_json(COLUMN_RECORDS, layout='columns', native_datetimes=False, pkg=pkg)
+    assert parsed['created'] == ['2018-05-22', '2018-05-23', '2018-05-99']
+
+
+NESTED_COLUMN_RECORDS = '[{"a": [{"d": "2018-05-22"}], "b": {"c": 1}}, {"a": null, "b": "2018-05-23"}]'
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_columns_nested(pkg):
+    parsed = from_json(NESTED_COLUMN_RECORDS, layout='columns', pkg=pkg)
+    assert parsed['a'] == [[{'d': date(2018, 5, 22)}], None]
+    assert parsed['b'] == [{'c': 1}, date(2018, 5, 23)]
+
+    parsed = from_json(NESTED_COLUMN_RECORDS, layout='columns', native_datetimes=False, pkg=pkg)
+    assert parsed['a'] == [[{'d': '2018-05-22'}], None]
+    assert parsed['b'] == [{'c': 1}, '2018-05-23']
+
+    parsed = from_json(NESTED_COLUMN_RECORDS, layout='columns', frozen=True, pkg=pkg)
+    assert parsed['a'] == ((MappingProxyType({'d': date(2018, 5, 22)}),), None)
+    assert isinstance(parsed['a'][0], tuple)
+    assert isinstance(parsed['a'][0][0], MappingProxyType)
+    assert isinstance(parsed['b'][0], MappingProxyType)
+    with pytest.raises(TypeError):
+        parsed['b'][0]['c'] = 2
+
+    parsed = from_jsonl('{"a": [{"d": "2018-05-22"}]}\n{"a": null}\n', layout='columns', frozen=True, pkg=pkg)
+    assert isinstance(parsed['a'][0][0], MappingProxyType)
+    assert parsed['a'][0][0]['d'] == date(2018, 5, 22)
+
+
+def test_parse_columns_compact():
+    parsed = from_json('[{"a": 1, "b": 1.5}, {"a": 2, "b": 2.5}]', layout='columns')
+    assert not isinstance(parsed['a'], list)
+    assert not isinstance(parsed['b'], list)
+
+
+def test_parse_columns_bad():
+    with pytest.raises(ValueError):
+        from_json('{"a": 1}', layout='columns')
+    with pytest.raises(ValueError):
+        from_json('[1, 2]', layout='columns')
+    with pytest.raises(ValueError):
+        from_json('[]', layout='foo')
+
+
+JSONL_RECORDS = """{"id": 1, "created": "2018-05-22"}
+
+{"id": 2, "created": "2018-05-23"}
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_lines(pkg):
+    assert from_jsonl(JSONL_RECORDS, pkg=pkg) == [
+        {'id': 1, 'created': date(2018, 5, 22)},
+        {'id': 2, 'created': date(2018, 5, 23)},
+    ]
+    assert from_jsonl(JSONL_RECORDS, native_datetimes=False, pkg=pkg) == [
+        {'id': 1, 'created': '2018-05-22'},
+        {'id': 2, 'created': '2018-05-23'},
+    ]
+
+    parsed = from_jsonl(JSONL_RECORDS, layout='columns', pkg=pkg)
+    assert list(parsed['id']) == [1, 2]
+    assert parsed['created'] == [date(2018, 5, 22), date(2018, 5, 23)]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_numpy_types(pkg):
+    np = pytest.importorskip('numpy')
+    value = {
+        'ints': np.arange(3),
+        'floats': np.array([[1.5, 2.5], [3.5, 4.5]], dtype=np.float32),
+        'strided': np.arange(6)[::2],
+        'bools': np.array([True, False]),
+        'dates': np.array(['2018-05-22T12:34:56'], dtype='datetime64[ns]'),
+        'float': np.float64(1.5),
+        'int': np.int32(4),
+        'bool': np.bool_(True),
+    }
+    assert from_json(to_json(value, pkg=pkg)) == {
+        'ints': [0, 1, 2],
+        'floats': [[1.5, 2.5], [3.5, 4.5]],
+        'strided': [0, 2, 4],
+        'bools': [True, False],
+        'dates': [datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_UTC)],
+        'float': 1.5,
+        'int': 4,
+        'bool': True,
+    }
+
+
+def test_lazy_imports():
+    import subprocess
+
+    modules = ('numpy', 'multiprocessing', 'concurrent.futures')
+    code = 'import sys, basicserial; print([m for m in %r if m in sys.modules])' % (modules,)
+    output = subprocess.check_output([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+    assert output.strip() == b'[]'
+
+
+OBJECT_TYPES = pkg_parameterize(
+    AVAILABLE_JSON_PACKAGES,
+    (
+        (CustomDataclass(123), '{"foo":123,"bar":"baz"}'),
+        (CustomSlots(123, 'baz'), '{"foo":123,"bar":"baz"}'),
+        (CustomSlots(123), '{"foo":123}'),
+        ([CustomDataclass(1), CustomDataclass(2, 'x')], '[{"foo":1,"bar":"baz"},{"foo":2,"bar":"x"}]'),
+    ),
+)
+
+@pytest.mark.parametrize('pkg,value,expected', OBJECT_TYPES)
+def test_object_types(pkg, value, expected):
+    assert to_json(value, pkg=pkg).replace(" ", "") == expected
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_attrs_type(pkg):
+    attr = pytest.importorskip('attr')
+
+    @attr.s
+    class CustomAttrs:
+        foo = attr.ib()
+        bar = attr.ib(default=date(2018, 5, 22))
+
+    assert to_json(CustomAttrs(123), pkg=pkg).replace(" ", "") == '{"foo":123,"bar":"2018-05-22"}'
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_stdlib_slots_types(pkg):
+    for value in (PurePosixPath('/etc/x'), IPv4Address('10.0.0.1')):
+        with pytest.raises(TypeError):
+            to_json({'v': value}, pkg=pkg)
+
+
+@pytest.mark.parametrize('stdlib_names', (True, False))
+@pytest.mark.parametrize('module_name', ('__main__', 'basicserial_dynamic'))
+def test_slots_type_without_module_file(module_name, stdlib_names, monkeypatch):
+    from types import ModuleType
+
+    if not stdlib_names:
+        # Python < 3.10 has no list of the stdlib's modules.
+        monkeypatch.delattr(sys, 'stdlib_module_names', raising=False)
+    monkeypatch.setitem(sys.modules, module_name, ModuleType(module_name))
+
+    class DynamicSlots:
+        __slots__ = ('foo',)
+
+    DynamicSlots.__module__ = module_name
+    value = DynamicSlots()
+    value.foo = 123
+    assert to_json(value).replace(' ', '') == '{"foo":123}'
+
+
+SHAPED_RECORDS = [
+    {'id': 1, 'name': 'foo', 'created': date(2018, 5, 22), 'tags': ('a',), 'extra': None},
+    {'id': 2, 'name': 'bar', 'created': date(2018, 5, 23), 'tags': ('b',), 'extra': None},
+    {'id': 3, 'name': None, 'created': '2018-05-24', 'tags': ('c',), 'extra': None},
+    {'id': 4, 'name': 'baz'},
+    OrderedDict([('id', 5), ('name', 'qux')]),
+]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_compiled_encoder(pkg):
+    encoder = compile_encoder(SHAPED_RECORDS[0])
+    assert encoder.keys == ('id', 'name', 'created', 'tags', 'extra')
+    assert to_json(SHAPED_RECORDS, encoder=encoder, pkg=pkg) == to_json(SHAPED_RECORDS, pkg=pkg)
+    assert to_json(SHAPED_RECORDS[0], encoder=encoder, pkg=pkg) == to_json(SHAPED_RECORDS[0], pkg=pkg)
+
+    encoder = compile_encoder({'id': int, 'name': str, 'created': date, 'tags': tuple, 'extra': type(None)})
+    assert to_json(SHAPED_RECORDS, encoder=encoder, pkg=pkg) == to_json(SHAPED_RECORDS, pkg=pkg)
+
+    encoder = compile_encoder({})
+    assert to_json([{}, {'a': 1}], encoder=encoder, pkg=pkg).replace(' ', '') == '[{},{"a":1}]'
+
+
+def test_compiled_encoder_bad():
+    with pytest.raises(ValueError):
+        compile_encoder([1, 2])
+    with pytest.raises(ValueError):
+        compile_encoder({'a': 1}, format='foo')
+    with pytest.raises(ValueError, match='compiled for yaml, not json'):
+        to_json({'a': date(2018, 5, 22)}, encoder=compile_encoder({'a': date}, format='yaml'))
+    with pytest.raises(ValueError, match='compiled for yaml, not json'):
+        list(iter_to_json([{'a': 1}], encoder=compile_encoder({'a': int}, format='yaml')))
+
+
+TYPED = """{
+    "id": 1,
+    "created": "2018-05-22T12:34:56Z",
+    "label": "2018-05-22",
+    "children": [
+        {"name": "foo", "born": "2018-05-22", "at": "12:34:56"},
+        {"name": "bar", "born": "2018-05-23", "at": null}
+    ],
+    "score": 3,
+    "tags": {"a": 1},
+    "parent": {"id": 2, "created": "2018-05-22T12:34:56", "label": "x", "children": []}
+}"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_into(pkg):
+    parsed = from_json(TYPED, into=TypedParent, pkg=pkg)
+    assert parsed == TypedParent(
+        id=1,
+        created=datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_UTC),
+        label='2018-05-22',
+        children=[
+            TypedChild('foo', date(2018, 5, 22), time(12, 34, 56)),
+            TypedChild('bar', date(2018, 5, 23)),
+        ],
+        score=3.0,
+        tags={'a': 1},
+        parent=TypedParent(2, datetime(2018, 5, 22, 12, 34, 56), 'x', []),
+    )
+    assert isinstance(parsed.score, float)
+
+    assert from_json('[{"name": "a", "born": "2018-05-22"}]', into=List[TypedChild], pkg=pkg) == [
+        TypedChild('a', date(2018, 5, 22)),
+    ]
+    assert from_json('null', into=Optional[TypedChild], pkg=pkg) is None
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_into_bad(pkg):
+    with pytest.raises(ValueError):
+        from_json('{"name": "a", "born": "nope"}', into=TypedChild, pkg=pkg)
+    with pytest.raises(ValueError):
+        from_json('{"name": 1, "born": "2018-05-22"}', into=TypedChild, pkg=pkg)
+    with pytest.raises(ValueError):
+        from_json('{"name": "a"}', into=TypedChild, pkg=pkg)
+    with pytest.raises(ValueError):
+        from_json('[true]', into=List[int], pkg=pkg)
+    with pytest.raises(TypeError):
+        from_json('[]', into=CustomSlots, pkg=pkg)
+
+
+PARALLEL_RECORDS = [
+    {'id': idx, 'name': 'item "%d" ,]}' % (idx,), 'day': '2018-05-22', 'tags': [{'deep': [[[idx]]]}]}
+    for idx in range(40)
+]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_parse_parallel(pkg, tmp_path):
+    import mmap
+
+    path = tmp_path / 'records.json'
+    path.write_text(to_json(PARALLEL_RECORDS, pretty=True, pkg=pkg))
+    expected = from_json(path.read_text(), pkg=pkg)
+    assert expected[0]['day'] == date(2018, 5, 22)
+
+    assert from_json(path, parallel=1, pkg=pkg) == expected
+    assert from_json(path, parallel=3, pkg=pkg) == expected
+    assert from_json(path, parallel=3, native_datetimes=False, pkg=pkg) == from_json(path.read_text(), native_datetimes=False, pkg=pkg)
+    assert isinstance(from_json(path, parallel=2, frozen=True, pkg=pkg), tuple)
+
+    with path.open('rb') as handle:
+        buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        assert from_json(buf, parallel=2, pkg=pkg) == expected
+        buf.close()
+
+    path.write_text('{"foo": "2018-05-22"}')
+    assert from_json(path, parallel=2, pkg=pkg) == {'foo': date(2018, 5, 22)}
+
+    for bad in ('[{"foo": 1}, {"foo": 2}', '[1, 2] 3', '[1, "2]'):
+        path.write_text(bad)
+        with pytest.raises(ValueError):
+            from_json(path, parallel=2, pkg=pkg)
+
+    path.write_text(' [ ] ')
+    assert from_json(path, parallel=2, pkg=pkg) == []
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+@pytest.mark.parametrize('bad', (
+    '[1, 2,]',
+    '[1, 2, ]',
+    '[,1, 2]',
+    '[ , 1, 2]',
+    '[1,, 2]',
+    '[,]',
+))
+def test_parse_parallel_empty_elements(pkg, bad, tmp_path):
+    path = tmp_path / 'values.json'
+    path.write_text(bad)
+    with pytest.raises(ValueError) as serial:
+        from_json(bad, pkg=pkg)
+    for parallel in (2, 3, 8):
+        with pytest.raises(ValueError) as parallel_error:
+            from_json(path, parallel=parallel, pkg=pkg)
+        assert type(parallel_error.value) is type(serial.value)
+
+
+def test_parse_parallel_bad(tmp_path):
+    with pytest.raises(ValueError, match='pass a pathlib.Path or mmap, not a str'):
+        from_json('[1, 2]', parallel=2)
+
+    path = tmp_path / 'values.json'
+    path.write_text('[1, 2]')
+    with pytest.raises(ValueError, match='pass a pathlib.Path or mmap, not a str'):
+        from_json(str(path), parallel=2)
+
+
+def feed_in_pieces(parser, data, size):
+    values = []
+    for idx in range(0, len(data), size):
+        values.extend(parser.feed(data[idx:idx + size]))
+    return values + parser.close()
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_feed_parser(pkg):
+    text = to_json(PARALLEL_RECORDS, pretty=True, pkg=pkg)
+    expected = from_json(text, pkg=pkg)
+
+    for size in (1, 7, 100, len(text)):
+        assert feed_in_pieces(JsonFeedParser(array_items=True, pkg=pkg), text, size) == expected
+        assert feed_in_pieces(JsonFeedParser(array_items=True, pkg=pkg), text.encode('utf-8'), size) == expected
+
+    parser = JsonFeedParser(array_items=True, native_datetimes=False, pkg=pkg)
+    assert parser.feed('[{"foo": "2018-05-22"}, "bar", 12') == [{'foo': '2018-05-22'}, 'bar']
+    assert parser.feed('3 ,  [') == [123]
+    assert parser.feed(']]  ') == [[]]
+    assert parser.close() == []
+
+    parser = JsonFeedParser(pkg=pkg)
+    assert parser.feed('{"foo": "2018-05-22"}\n"\\"caf\u00e9\\""[1]12') == [{'foo': date(2018, 5, 22)}, '"caf\u00e9"', [1]]
+    assert parser.feed(' true') == [12]
+    assert parser.close() == [True]
+
+    assert feed_in_pieces(JsonFeedParser(pkg=pkg), '"\u00e9\U0001f600"'.encode('utf-8'), 1) == ['\u00e9\U0001f600']
+
+
+FEED_BAD = (
+    ('[1, 2', True),
+    ('[1 2]', True),
+    ('[1] 2', True),
+    ('{}', True),
+    ('{"foo": 1', False),
+    ('"foo', False),
+    ('1, 2', False),
+    ('[1, }', False),
+    (b'"\xc3', False),
+)
+
+
+@pytest.mark.parametrize('value,array_items', FEED_BAD)
+def test_feed_parser_bad(value, array_items):
+    parser = JsonFeedParser(array_items=array_items)
+    with pytest.raises(ValueError):
+        parser.feed(value)
+        parser.close()
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_iter_to_json(pkg):
+    for count in (0, 1, 2, 3, 10):
+        records = [CustomNamedTuple(foo=date(2018, 5, idx + 1)) for idx in range(count)]
+        expected = to_json(records, pkg=pkg)
+
+        for chunk_size in (1, 3, 100):
+            pieces = list(iter_to_json(iter(records), chunk_size=chunk_size, pkg=pkg))
+            assert all(isinstance(piece, bytes) for piece in pieces)
+            assert b''.join(pieces).decode('utf-8') == expected
+
+    encoder = compile_encoder({'foo': 'bar'})
+    records = ({'foo': 'bär %d' % (idx,)} for idx in range(5))
+    assert b''.join(iter_to_json(records, chunk_size=2, pkg=pkg, encoder=encoder)).decode('utf-8') \
+        == to_json([{'foo': 'bär %d' % (idx,)} for idx in range(5)], pkg=pkg)
+
+    with pytest.raises(ValueError):
+        list(iter_to_json([], chunk_size=0, pkg=pkg))
+
+
+INDEX_LINES = (
+    '{"id": "a", "when": "2018-05-22", "n": 0}\n'
+    '\n'
+    '  \n'
+    '{"id": 2, "n": 1}\n'
+    '{"id": "a", "n": 2}\n'
+    ' {"n": 3}\n'
+    '[4]\n'
+    '{"id": "2", "n": 5}'
+)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_jsonl_index(pkg, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    path.write_text(INDEX_LINES)
+
+    with JsonlIndex(path, pkg=pkg) as index:
+        assert len(index) == 6
+        assert index.get(0) == {'id': 'a', 'when': date(2018, 5, 22), 'n': 0}
+        assert index.get(3) == {'n': 3}
+        assert index.get(4) == [4]
+        assert index.get(-1) == {'id': '2', 'n': 5}
+        with pytest.raises(IndexError):
+            index.get(6)
+        with pytest.raises(ValueError):
+            index.lookup('a')
+    assert (tmp_path / 'records.jsonl.idx').exists()
+
+    for _ in range(2):
+        with JsonlIndex(path, key='id', pkg=pkg, native_datetimes=False) as index:
+            assert len(index) == 6
+            assert index.lookup('a') == {'id': 'a', 'when': '2018-05-22', 'n': 0}
+            assert index.lookup(2) == {'id': 2, 'n': 1}
+            assert index.lookup('2') == {'id': '2', 'n': 5}
+            with pytest.raises(KeyError):
+                index.lookup('b')
+            with pytest.raises(KeyError):
+                index.lookup(2.5)
+
+    path.write_text(INDEX_LINES + '\n{"id": "b", "n": 6}\n')
+    with JsonlIndex(path, key='id', pkg=pkg) as index:
+        assert len(index) == 7
+        assert index.lookup('b') == {'id': 'b', 'n': 6}
+        assert index.lookup('a') == {'id': 'a', 'when': date(2018, 5, 22), 'n': 0}
+
+    empty = tmp_path / 'empty.jsonl'
+    empty.write_text('')
+    with JsonlIndex(empty, key='id', pkg=pkg, index_path=False) as index:
+        assert len(index) == 0
+        with pytest.raises(KeyError):
+            index.lookup('a')
+    assert not (tmp_path / 'empty.jsonl.idx').exists()
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_limits(pkg):
+    value = '{"foo": [1, 2, {"bar": "2018-05-22"}], "baz": "bär"}'
+    expected = {'foo': [1, 2, {'bar': date(2018, 5, 22)}], 'baz': 'bär'}
+
+    size = len(value.encode('utf-8'))
+    assert from_json(value, pkg=pkg, max_bytes=size, max_depth=3, max_nodes=10) == expected
+    with pytest.raises(LimitExceededError):
+        from_json(value, pkg=pkg, max_bytes=size - 1)
+    with pytest.raises(LimitExceededError):
+        from_json(value, pkg=pkg, max_depth=2)
+    with pytest.raises(LimitExceededError):
+        from_json(value, pkg=pkg, max_nodes=9)
+    with pytest.raises(ValueError):
+        from_json(value, pkg=pkg, max_nodes=-1)
+
+    lines = value + '\n' + value + '\n'
+    assert from_jsonl(lines, pkg=pkg, max_nodes=20) == [expected, expected]
+    with pytest.raises(LimitExceededError):
+        from_jsonl(lines, pkg=pkg, max_nodes=19)
+    with pytest.raises(LimitExceededError):
+        from_jsonl(lines, pkg=pkg, max_bytes=len(value))
+
+    output = to_json(expected, pkg=pkg)
+    size = len(output.encode('utf-8'))
+    assert to_json(expected, pkg=pkg, max_bytes=size, max_depth=3, max_nodes=10) == output
+    with pytest.raises(LimitExceededError):
+        to_json(expected, pkg=pkg, max_bytes=size - 1)
+    with pytest.raises(LimitExceededError):
+        to_json(expected, pkg=pkg, max_depth=2)
+    with pytest.raises(LimitExceededError):
+        to_json(CustomNamedTuple(foo=[expected]), pkg=pkg, max_depth=3)
+    with pytest.raises(LimitExceededError):
+        to_json(expected, pkg=pkg, max_nodes=9)
+
+    cyclic = []
+    cyclic.append(cyclic)
+    with pytest.raises(LimitExceededError):
+        to_json(cyclic, pkg=pkg, max_depth=100)
+
+
+@pytest.mark.parametrize('pkg', ('json', 'simplejson'))
+def test_limits_recursion(pkg):
+    if pkg not in AVAILABLE_JSON_PACKAGES:
+        pytest.skip('%s is not available' % (pkg,))
+
+    deep = '[' * 100000 + ']' * 100000
+    with pytest.raises(LimitExceededError):
+        from_json(deep, pkg=pkg)
+    with pytest.raises(LimitExceededError):
+        from_json(deep, pkg=pkg, max_depth=10)
+
+
+def test_normalizer():
+    normalize = Normalizer((str, int, float, bool, type(None)), ((date, str),))
+
+    unchanged = {'foo': [1, 'two', {'three': None}], 'bar': ([4.5],)}
+    normalized = normalize(unchanged)
+    assert normalized == {'foo': [1, 'two', {'three': None}], 'bar': [[4.5]]}
+    assert normalized['foo'] is unchanged['foo']
+    assert normalized['bar'][0] is unchanged['bar'][0]
+
+    changed = {'foo': [1, date(2018, 5, 22)], 'bar': [2]}
+    normalized = normalize(changed)
+    assert normalized == {'foo': [1, '2018-05-22'], 'bar': [2]}
+    assert normalized is not changed
+    assert normalized['foo'] is not changed['foo']
+    assert normalized['bar'] is changed['bar']
+    assert changed['foo'][1] == date(2018, 5, 22)
+
+    ordered = OrderedDict([('b', 1), ('a', CustomNamedTuple(foo=CustomEnum.a_str))])
+    normalized = normalize(ordered)
+    assert type(normalized) is dict
+    assert list(normalized.items()) == [('b', 1), ('a', {'foo': 'foo'})]
+
+    assert normalize(CustomUserList([CustomDataclass(1)])) == [{'foo': 1, 'bar': 'baz'}]
+    assert normalize(date(2018, 5, 22)) == '2018-05-22'
+    assert normalize([]) == []
+    assert normalize({}) == {}
+
+    deep = []
+    for _ in range(100000):
+        deep = [deep, date(2018, 5, 22)]
+    normalized = normalize(deep)
+    for _ in range(100000):
+        assert normalized[1] == '2018-05-22'
+        normalized = normalized[0]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_shared_references(pkg):
+    table = {'foo': [date(2018, 5, 22), CustomEnum.an_int]}
+    value = {'first': table, 'second': [table, table]}
+    assert from_json(to_json(value, pkg=pkg), native_datetimes=False) == {
+        'first': {'foo': ['2018-05-22', 1]},
+        'second': [{'foo': ['2018-05-22', 1]}, {'foo': ['2018-05-22', 1]}],
+    }
+
+    circular = {'foo': [1]}
+    circular['foo'].append(circular)
+    with pytest.raises(ValueError, match='Circular reference detected'):
+        to_json(circular, pkg=pkg)
+    with pytest.raises(ValueError, match='Circular reference detected'):
+        list(iter_to_json([circular], pkg=pkg))
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_encode_memo(pkg):
+    memo = EncodeMemo()
+    frozen = (CustomNamedTuple(foo=date(2018, 5, 22)), frozenset([Decimal('1.5')]))
+    thawed = (1, [date(2018, 5, 22)])
+    value = {'frozen': frozen, 'thawed': thawed}
+    expected = '{"frozen":[{"foo":"2018-05-22"},[1.5]],"thawed":[1,["2018-05-22"]]}'
+    assert to_json(value, pkg=pkg, memo=memo).replace(' ', '') == expected
+    assert len(memo) == 3
+
+    thawed[1][0] = 2
+    assert to_json(value, pkg=pkg, memo=memo).replace(' ', '') == expected.replace('["2018-05-22"]', '[2]')
+    assert len(memo) == 3
+    assert b''.join(iter_to_json([frozen, frozen], chunk_size=1, pkg=pkg, memo=memo)).replace(b' ', b'') \
+        == b'[[{"foo":"2018-05-22"},[1.5]],[{"foo":"2018-05-22"},[1.5]]]'
+
+    memo.clear()
+    assert len(memo) == 0
+    memo = EncodeMemo(max_size=1)
+    to_json(value, pkg=pkg, memo=memo)
+    assert len(memo) == 1
+
+
+def test_normalizer_shared():
+    normalize = Normalizer((str, int, float, bool, type(None)), ((date, str),))
+    memo = EncodeMemo()
+
+    table = [date(2018, 5, 22)] * 100
+    normalized = normalize({'foo': table, 'bar': (table, table)})
+    assert normalized['foo'] == ['2018-05-22'] * 100
+    assert normalized['foo'] is normalized['bar'][0] is normalized['bar'][1]
+
+    diamond = [date(2018, 5, 22)]
+    for _ in range(200):
+        diamond = [diamond, diamond]
+    normalized = normalize(diamond)
+    for _ in range(190):
+        assert normalized[0] is normalized[1]
+        normalized = normalized[0]
+    for _ in range(10):
+        assert normalized[0] == normalized[1]
+        normalized = normalized[0]
+    assert normalized == ['2018-05-22']
+
+    frozen = (1, (date(2018, 5, 22),))
+    assert normalize(frozen, memo) is normalize(frozen, memo)
+    assert normalize(frozen) is not normalize(frozen)
+
+    circular = [1]
+    circular.append((circular,))
+    with pytest.raises(ValueError, match='Circular reference detected'):
+        normalize(circular)
+    assert len(memo) == 2
+
+    deep = []
+    for _ in range(5000):
+        deep = [deep]
+    deep[0][0][0].append(deep)
+    with pytest.raises(ValueError, match='Circular reference detected'):
+        normalize(deep)
+
+
+DECIMAL_JSON_PACKAGES = tuple(
+    pkg
+    for pkg in AVAILABLE_JSON_PACKAGES
+    if pkg in ('rapidjson', 'simplejson')
+    or (pkg == 'orjson' and hasattr(sys.modules.get('orjson'), 'Fragment'))
+)
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_from_json_decimals(pkg, tmp_path):
+    value = from_json('{"price": 1.10, "qty": 2, "big": 1e5, "day": "2018-05-22"}', decimals=True, pkg=pkg)
+    assert value == {'price': Decimal('1.10'), 'qty': 2, 'big': Decimal('1E+5'), 'day': date(2018, 5, 22)}
+    assert str(value['price']) == '1.10'
+    assert isinstance(value['qty'], int)
+
+    assert from_json('{"price": 1.10}', pkg=pkg) == {'price': 1.1}
+
+    path = tmp_path / 'records.json'
+    path.write_text('[{"price": 0.1}, {"price": 0.2}, {"price": 3}]')
+    assert from_json(path, parallel=2, decimals=True, pkg=pkg) == [{'price': Decimal('0.1')}, {'price': Decimal('0.2')}, {'price': 3}]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_to_json_decimals(pkg):
+    value = {'price': Decimal('1.10'), 'huge': Decimal('12345678901234567890.123456789'), 'qty': 2}
+    if pkg in DECIMAL_JSON_PACKAGES:
+        expected = '{"price":1.10,"huge":12345678901234567890.123456789,"qty":2}'
+        assert to_json(value, decimals=True, pkg=pkg).replace(' ', '') == expected
+        assert from_json(to_json(value, decimals=True, pkg=pkg), decimals=True, pkg=pkg) == value
+        assert '1.10' in to_json([(Decimal('1.10'),)], decimals=True, pretty=True, pkg=pkg)
+    else:
+        with pytest.raises(ValueError, match='cannot write Decimals exactly'):
+            to_json(value, decimals=True, pkg=pkg)
+
+    assert to_json(Decimal('1.10'), pkg=pkg) == '1.1'
+    encoder = compile_encoder(value)
+    with pytest.raises(ValueError, match='cannot be combined'):
+        to_json(value, decimals=True, pkg=pkg, encoder=encoder)
+
+
+@pytest.mark.skipif(not DECIMAL_JSON_PACKAGES, reason='No package can write Decimals')
+def test_to_json_decimals_default():
+    assert to_json(Decimal('1.10'), decimals=True) == '1.10'
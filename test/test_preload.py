@@ -0,0 +1,39 @@
+import gc
+
+from .common import *
+from basicserial import (
+    warmup,
+    AVAILABLE_JSON_PACKAGES,
+    AVAILABLE_TOML_PACKAGES,
+    AVAILABLE_YAML_PACKAGES,
+)
+
+
+def test_warmup():
+    assert warmup() == AVAILABLE_JSON_PACKAGES + AVAILABLE_YAML_PACKAGES + AVAILABLE_TOML_PACKAGES
+    assert warmup(formats=['toml']) == AVAILABLE_TOML_PACKAGES
+    assert warmup(formats=['yaml', 'json']) == AVAILABLE_YAML_PACKAGES + AVAILABLE_JSON_PACKAGES
+    assert warmup(pkgs=[AVAILABLE_JSON_PACKAGES[0]]) == (AVAILABLE_JSON_PACKAGES[0],)
+    assert warmup(formats=['json'], pkgs=[]) == ()
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES + AVAILABLE_YAML_PACKAGES + AVAILABLE_TOML_PACKAGES)
+def test_warmup_pkg(pkg):
+    assert warmup(pkgs=[pkg]) == (pkg,)
+
+
+def test_warmup_freeze_gc():
+    try:
+        warmup(formats=['json'], freeze_gc=True)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_warmup_bad():
+    with pytest.raises(ValueError):
+        warmup(formats=['xml'])
+    with pytest.raises(ValueError):
+        warmup(pkgs=['doesntexist'])
+    with pytest.raises(ValueError):
+        warmup(formats=['json'], pkgs=[AVAILABLE_YAML_PACKAGES[0]])
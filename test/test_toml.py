@@ -1,6 +1,6 @@
 from .common import *
 
-from basicserial import to_toml, from_toml, AVAILABLE_TOML_PACKAGES
+from basicserial import to_toml, from_toml, LimitExceededError, AVAILABLE_TOML_PACKAGES
 
 
 def q(pkg, value):
@@ -21,15 +21,6 @@ SIMPLE_TYPES = pkg_parameterize(
         (complex(123, 45), '"(123+45j)"'),
         (Decimal('123.45'), '123.45'),
         (Fraction(1, 3), '"1/3"'),
-        (date(2018, 5, 22), '"2018-05-22"'),
-        (time(12, 34, 56), '"12:34:56"'),
-        (time(12, 34, 56, 789), '"12:34:56.000789"'),
-        (time(12, 34, 56, 789000), '"12:34:56.789000"'),
-        (datetime(2018, 5, 22, 12, 34, 56), '"2018-05-22T12:34:56"'),
-        (datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_EST), '"2018-05-22T12:34:56-04:56"'),
-        (datetime(2018, 5, 22, 12, 34, 56, 789), '"2018-05-22T12:34:56.000789"'),
-        (datetime(2018, 5, 22, 12, 34, 56, 789000), '"2018-05-22T12:34:56.789000"'),
-        (datetime(2018, 5, 22, 12, 34, 56, 789000, tzinfo=TZ_EST), '"2018-05-22T12:34:56.789000-04:56"'),
         (CustomEnum.an_int, '1'),
         (CustomEnum.a_str, '"foo"'),
         (CustomEnum.a_bool, 'false'),
@@ -42,6 +33,39 @@ def test_simple_types(pkg, value, expected):
     assert to_toml({'foo': value}, pkg=pkg) == 'foo = %s' % (q(pkg, expected),)
 
 
+DATETIME_TYPES = pkg_parameterize(
+    AVAILABLE_TOML_PACKAGES,
+    (
+        (date(2018, 5, 22), '2018-05-22'),
+        (time(12, 34, 56), '12:34:56'),
+        (time(12, 34, 56, 789), '12:34:56.000789'),
+        (time(12, 34, 56, 789000), '12:34:56.789000'),
+        (datetime(2018, 5, 22, 12, 34, 56), '2018-05-22T12:34:56'),
+        (datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_EST), '2018-05-22T12:34:56-04:56'),
+        (datetime(2018, 5, 22, 12, 34, 56, 789), '2018-05-22T12:34:56.000789'),
+        (datetime(2018, 5, 22, 12, 34, 56, 789000), '2018-05-22T12:34:56.789000'),
+        (datetime(2018, 5, 22, 12, 34, 56, 789000, tzinfo=TZ_EST), '2018-05-22T12:34:56.789000-04:56'),
+    ),
+)
+
+@pytest.mark.parametrize('pkg,value,expected', DATETIME_TYPES)
+def test_datetime_types(pkg, value, expected):
+    if pkg == 'pytoml':
+        # pytoml can't write these natively
+        expected = '"%s"' % (expected,)
+    elif pkg == 'tomli':
+        expected = expected.replace('T', ' ')
+    out = to_toml({'foo': value}, pkg=pkg)
+    assert out == 'foo = %s' % (expected,)
+    assert from_toml(out, pkg=pkg) == {'foo': value}
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_offset_time(pkg):
+    value = time(12, 34, 56, tzinfo=TZ_UTC)
+    assert to_toml({'foo': value}, pkg=pkg) == 'foo = %s' % (q(pkg, '"12:34:56+00:00"'),)
+
+
 @pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
 def test_unknown_type(pkg):
     with pytest.raises(Exception):
@@ -192,3 +216,144 @@ def test_parse_no_datetime(pkg):
         "2018-05-22T12:34:56.000789-04:56",
     ]
 
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_numpy_types(pkg):
+    np = pytest.importorskip('numpy')
+    parsed = from_toml(to_toml({'foo': np.arange(3), 'bar': np.float64(1.5), 'baz': np.int8(3)}, pkg=pkg), pkg=pkg)
+    assert parsed == {'foo': [0, 1, 2], 'bar': 1.5, 'baz': 3}
+
+
+OBJECT_TYPES = pkg_parameterize(
+    AVAILABLE_TOML_PACKAGES,
+    (
+        ({'foo': CustomDataclass(123)}, '[foo]\nfoo = 123\nbar = "baz"'),
+        ({'foo': CustomSlots(123, 'baz')}, '[foo]\nfoo = 123\nbar = "baz"'),
+        ({'foo': [Decimal('1.5'), Decimal('2.5')]}, 'foo = [1.5, 2.5]'),
+        ({'foo': [CustomEnum.an_int, CustomEnum.an_int]}, 'foo = [1, 1]'),
+    ),
+)
+
+@pytest.mark.parametrize('pkg,value,expected', OBJECT_TYPES)
+def test_object_types(pkg, value, expected):
+    assert from_toml(to_toml(value, pkg=pkg), pkg=pkg) == from_toml(expected, pkg=pkg)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_stdlib_slots_types(pkg):
+    for value in (PurePosixPath('/etc/x'), IPv4Address('10.0.0.1')):
+        try:
+            result = to_toml({'v': value}, pkg=pkg)
+        except Exception:
+            continue
+        assert result.startswith('v = "')
+        assert '_' not in result
+
+
+def test_stdlib_slots_types_pytoml():
+    if 'pytoml' not in AVAILABLE_TOML_PACKAGES:
+        pytest.skip('pytoml is not available')
+    assert to_toml({'v': PurePosixPath('/etc/x')}, pkg='pytoml') == 'v = "/etc/x"'
+
+
+TYPED = """
+id = 1
+created = 2018-05-22T12:34:56Z
+label = "2018-05-22"
+score = 1.5
+
+[tags]
+a = 1
+
+[[children]]
+name = "foo"
+born = "2018-05-22"
+at = "12:34:56"
+
+[[children]]
+name = "bar"
+born = "2018-05-23"
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_parse_into(pkg):
+    parsed = from_toml(TYPED, into=TypedParent, pkg=pkg)
+    assert parsed == TypedParent(
+        id=1,
+        created=datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_UTC),
+        label='2018-05-22',
+        children=[
+            TypedChild('foo', date(2018, 5, 22), time(12, 34, 56)),
+            TypedChild('bar', date(2018, 5, 23)),
+        ],
+        score=1.5,
+        tags={'a': 1},
+    )
+    assert type(parsed.label) is str
+
+
+NATIVE_TYPES = """
+str = '2018-05-22'
+datetime = 2018-05-22T12:34:56Z
+list = ['2018-05-22', 'foo']
+
+[table]
+datetime = 1979-05-27T07:32:00-08:00
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_parse_native_types(pkg):
+    parsed = from_toml(NATIVE_TYPES, native_datetimes=False, pkg=pkg)
+    assert parsed == {
+        'str': '2018-05-22',
+        'datetime': datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_UTC),
+        'list': ['2018-05-22', 'foo'],
+        'table': {
+            'datetime': datetime(1979, 5, 27, 15, 32, tzinfo=TZ_UTC),
+        },
+    }
+    assert type(parsed['table']) is dict
+    assert type(parsed['list']) is list
+    assert type(parsed['str']) is str
+
+    parsed = from_toml(NATIVE_TYPES, pkg=pkg)
+    assert parsed['str'] == date(2018, 5, 22)
+    assert parsed['list'] == [date(2018, 5, 22), 'foo']
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_limits(pkg):
+    value = 'foo = [1, 2]\n\n[bar]\nbaz = "2018-05-22"\n'
+    expected = {'foo': [1, 2], 'bar': {'baz': date(2018, 5, 22)}}
+
+    assert from_toml(value, pkg=pkg, max_bytes=len(value), max_depth=2, max_nodes=9) == expected
+    with pytest.raises(LimitExceededError):
+        from_toml(value, pkg=pkg, max_bytes=len(value) - 1)
+    with pytest.raises(LimitExceededError):
+        from_toml(value, pkg=pkg, max_depth=1)
+    with pytest.raises(LimitExceededError):
+        from_toml(value, pkg=pkg, max_nodes=8)
+
+    output = to_toml(expected, pkg=pkg)
+    assert to_toml(expected, pkg=pkg, max_bytes=len(output), max_depth=2, max_nodes=9) == output
+    with pytest.raises(LimitExceededError):
+        to_toml(expected, pkg=pkg, max_bytes=len(output) - 1)
+    with pytest.raises(LimitExceededError):
+        to_toml(expected, pkg=pkg, max_depth=1)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_shared_references(pkg):
+    table = {'foo': [Decimal('1.5'), Decimal('2.5')]}
+    assert from_toml(to_toml({'first': table, 'second': table}, pkg=pkg)) == {
+        'first': {'foo': [1.5, 2.5]},
+        'second': {'foo': [1.5, 2.5]},
+    }
+
+    circular = {'foo': {}}
+    circular['foo']['bar'] = circular
+    with pytest.raises(ValueError, match='Circular reference detected'):
+        to_toml(circular, pkg=pkg)
@@ -0,0 +1,160 @@
+from io import StringIO
+
+from .common import *
+from basicserial import (
+    transcode,
+    from_json,
+    from_toml,
+    from_yaml,
+    from_yaml_all,
+    to_json,
+    AVAILABLE_JSON_PACKAGES,
+    AVAILABLE_TOML_PACKAGES,
+    AVAILABLE_YAML_PACKAGES,
+)
+
+
+def run_transcode(src, src_format, dst_format, **kwargs):
+    out = StringIO()
+    count = transcode(src, src_format, dst_format, out, **kwargs)
+    return count, out.getvalue()
+
+
+YAML_DOCUMENTS = """
+foo: 123
+when: 2018-05-22
+tags: [a, b]
+---
+foo: 456
+when: '12:34:56'
+---
+~
+"""
+
+
+@pytest.mark.parametrize('src_pkg', AVAILABLE_YAML_PACKAGES)
+@pytest.mark.parametrize('dst_pkg', AVAILABLE_JSON_PACKAGES)
+def test_yaml_to_json(src_pkg, dst_pkg):
+    count, output = run_transcode(YAML_DOCUMENTS, 'yaml', 'json', src_pkg=src_pkg, dst_pkg=dst_pkg)
+    assert count == 3
+    assert from_json(output, native_datetimes=False) == [
+        {'foo': 123, 'when': '2018-05-22', 'tags': ['a', 'b']},
+        {'foo': 456, 'when': '12:34:56'},
+        None,
+    ]
+
+    count, output = run_transcode('foo: 2018-05-22', 'yaml', 'json', src_pkg=src_pkg, dst_pkg=dst_pkg)
+    assert count == 1
+    assert from_json(output, native_datetimes=False) == [{'foo': '2018-05-22'}]
+
+    count, output = run_transcode(StringIO(YAML_DOCUMENTS), 'yaml', 'jsonl', src_pkg=src_pkg, dst_pkg=dst_pkg)
+    assert count == 3
+    assert [from_json(line) for line in output.splitlines()] == [
+        {'foo': 123, 'when': date(2018, 5, 22), 'tags': ['a', 'b']},
+        {'foo': 456, 'when': time(12, 34, 56)},
+        None,
+    ]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_yaml_to_json_fallback(pkg):
+    count, output = run_transcode('!!set {a: null}', 'yaml', 'json', src_pkg=pkg)
+    assert count == 1
+    assert from_json(output) == [['a']]
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_yaml_to_json_matches_to_json(pkg):
+    src = 'when: 2018-05-22 12:34:56\nprice: 1.5\n---\n[1, 2]\n'
+    documents = from_yaml_all(src)
+
+    count, output = run_transcode(src, 'yaml', 'json', dst_pkg=pkg)
+    assert count == 2
+    assert output == to_json(documents, pkg=pkg)
+
+    count, output = run_transcode(src, 'yaml', 'jsonl', dst_pkg=pkg)
+    assert output.splitlines() == [to_json(document, pkg=pkg) for document in documents]
+
+
+JSONL_DOCUMENTS = '{"foo": 123, "when": "2018-05-22"}\n\n{"foo": 456, "when": "12:34:56"}\n'
+
+
+@pytest.mark.parametrize('src_pkg', AVAILABLE_JSON_PACKAGES)
+@pytest.mark.parametrize('dst_pkg', AVAILABLE_YAML_PACKAGES)
+def test_jsonl_to_yaml(src_pkg, dst_pkg):
+    expected = [
+        {'foo': 123, 'when': date(2018, 5, 22)},
+        {'foo': 456, 'when': time(12, 34, 56)},
+    ]
+
+    for src in (JSONL_DOCUMENTS, JSONL_DOCUMENTS.encode('utf-8'), StringIO(JSONL_DOCUMENTS)):
+        count, output = run_transcode(src, 'jsonl', 'yaml', src_pkg=src_pkg, dst_pkg=dst_pkg)
+        assert count == 2
+        assert [from_yaml(doc, pkg=dst_pkg) for doc in output.split('---\n')] == expected
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_jsonl_to_json(pkg):
+    lines = JSONL_DOCUMENTS.splitlines()
+    for src, expected in (
+            ('', []),
+            (lines[0], [{'foo': 123, 'when': '2018-05-22'}]),
+            (JSONL_DOCUMENTS, [{'foo': 123, 'when': '2018-05-22'}, {'foo': 456, 'when': '12:34:56'}]),
+            ('[1, 2]\n', [[1, 2]])):
+        count, output = run_transcode(src, 'jsonl', 'json', src_pkg=pkg, dst_pkg=pkg)
+        assert count == len(expected)
+        assert from_json(output, native_datetimes=False) == expected
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_json_to_jsonl(pkg):
+    count, output = run_transcode('[{"foo": 1}, [2, 3], "2018-05-22"]', 'json', 'jsonl', src_pkg=pkg, dst_pkg=pkg)
+    assert count == 3
+    assert [from_json(line, native_datetimes=False) for line in output.splitlines()] == [{'foo': 1}, [2, 3], '2018-05-22']
+
+    count, output = run_transcode('[]', 'json', 'jsonl', src_pkg=pkg, dst_pkg=pkg)
+    assert (count, output) == (0, '')
+
+    count, output = run_transcode('{"foo": [1, 2]}', 'json', 'jsonl', src_pkg=pkg, dst_pkg=pkg)
+    assert count == 1
+    assert from_json(output) == {'foo': [1, 2]}
+    assert output.count('\n') == 1
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_JSON_PACKAGES)
+def test_json_to_json(pkg):
+    for src in ('{"foo": 1}', '[{"foo": 1}]', '[]', '"2018-05-22"'):
+        count, output = run_transcode(src, 'json', 'json', src_pkg=pkg, dst_pkg=pkg)
+        assert count == 1
+        assert from_json(output, native_datetimes=False) == from_json(src, native_datetimes=False)
+
+
+@pytest.mark.parametrize('src_pkg', AVAILABLE_JSON_PACKAGES)
+@pytest.mark.parametrize('dst_pkg', AVAILABLE_TOML_PACKAGES)
+def test_json_to_toml(src_pkg, dst_pkg):
+    count, output = run_transcode('{"foo": 123, "bar": {"baz": "2018-05-22"}}', 'json', 'toml', src_pkg=src_pkg, dst_pkg=dst_pkg)
+    assert count == 1
+    assert from_toml(output, pkg=dst_pkg) == {'foo': 123, 'bar': {'baz': date(2018, 5, 22)}}
+
+    with pytest.raises(ValueError):
+        run_transcode(JSONL_DOCUMENTS, 'jsonl', 'toml', src_pkg=src_pkg, dst_pkg=dst_pkg)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_TOML_PACKAGES)
+def test_toml_to_json(pkg):
+    count, output = run_transcode('foo = 123\n\n[bar]\nbaz = "qux"\n', 'toml', 'json', src_pkg=pkg)
+    assert count == 1
+    assert from_json(output) == {'foo': 123, 'bar': {'baz': 'qux'}}
+
+
+def test_empty():
+    assert run_transcode('', 'jsonl', 'json') == (0, '[]')
+    assert run_transcode('', 'yaml', 'json') == (0, '[]')
+    assert run_transcode('', 'jsonl', 'toml') == (0, '')
+
+
+def test_bad_format():
+    with pytest.raises(ValueError):
+        run_transcode('{}', 'xml', 'json')
+    with pytest.raises(ValueError):
+        run_transcode('{}', 'json', 'xml')
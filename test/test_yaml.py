@@ -1,6 +1,8 @@
+from io import StringIO
+
 from .common import *
 
-from basicserial import to_yaml, from_yaml, AVAILABLE_YAML_PACKAGES
+from basicserial import to_yaml, from_yaml, from_yaml_all, compile_encoder, LimitExceededError, AVAILABLE_YAML_PACKAGES
 
 
 SIMPLE_TYPES = pkg_parameterize(
@@ -233,3 +235,334 @@ def test_parse_no_datetime(pkg):
     assert from_yaml('2018-05-22', native_datetimes=False, pkg=pkg) == '2018-05-22'
     assert from_yaml("'12:34:56'", native_datetimes=False, pkg=pkg) == '12:34:56'
 
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_numpy_types(pkg):
+    np = pytest.importorskip('numpy')
+    assert to_yaml(np.arange(3), pkg=pkg) == '[0, 1, 2]'
+    assert to_yaml({'foo': np.float64(1.5), 'bar': np.bool_(False)}, pkg=pkg) == '{bar: false, foo: 1.5}'
+
+
+OBJECT_TYPES = pkg_parameterize(
+    AVAILABLE_YAML_PACKAGES,
+    (
+        (CustomDataclass(123), '{foo: 123, bar: baz}'),
+        (CustomSlots(123, 'baz'), '{foo: 123, bar: baz}'),
+        (CustomSlots(123), '{foo: 123}'),
+    ),
+)
+
+@pytest.mark.parametrize('pkg,value,expected', OBJECT_TYPES)
+def test_object_types(pkg, value, expected):
+    assert to_yaml(value, pkg=pkg) == expected
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_stdlib_slots_types(pkg):
+    for value in (PurePosixPath('/etc/x'), IPv4Address('10.0.0.1')):
+        with pytest.raises(Exception, match='cannot represent'):
+            to_yaml({'v': value}, pkg=pkg)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_compiled_encoder(pkg):
+    records = [
+        {'id': 1, 'kind': CustomEnum.a_str, 'created': date(2018, 5, 22), 'uuid': uuid4()},
+        {'id': 2, 'kind': CustomEnum.an_int, 'created': date(2018, 5, 23), 'uuid': uuid4()},
+        {'id': 3},
+    ]
+    encoder = compile_encoder(records[0], format='yaml')
+    assert to_yaml(records, encoder=encoder, pkg=pkg) == to_yaml(records, pkg=pkg)
+    assert to_yaml(records, encoder=encoder, pretty=True, pkg=pkg) == to_yaml(records, pretty=True, pkg=pkg)
+
+    with pytest.raises(ValueError, match='compiled for json, not yaml'):
+        to_yaml(records, encoder=compile_encoder(records[0]), pkg=pkg)
+
+
+TYPED = """
+id: 1
+created: 2018-05-22T12:34:56Z
+label: 2018-05-22
+children:
+  - name: foo
+    born: 2018-05-22
+    at: '12:34:56'
+  - name: bar
+    born: 2018-05-23
+tags:
+  a: 1
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_parse_into(pkg):
+    assert from_yaml(TYPED, into=TypedParent, pkg=pkg) == TypedParent(
+        id=1,
+        created=datetime(2018, 5, 22, 12, 34, 56, tzinfo=TZ_UTC),
+        label='2018-05-22',
+        children=[
+            TypedChild('foo', date(2018, 5, 22), time(12, 34, 56)),
+            TypedChild('bar', date(2018, 5, 23)),
+        ],
+        tags={'a': 1},
+    )
+
+
+FAST_FLOW_TYPES = (
+    {'foo': 'bar', 'baz': [1, 2.5, None, True, False, ''], 'nested': {'a': {'b': []}}},
+    ['2018-05-22', '12:34:56', 'x: y', '# not a comment', "it's", 'say "hi"', '\t\n\\', 'caf\xe9'],
+    [0.0, -0.0, 0.0001, 123456789012.5, -1.5, 12345678901234567890],
+    'foo',
+    123,
+    None,
+)
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+@pytest.mark.parametrize('value', FAST_FLOW_TYPES)
+def test_fast_flow(pkg, value):
+    out = to_yaml(value, fast_flow=True, pkg=pkg)
+    assert from_yaml(out, pkg=pkg) == from_yaml(to_yaml(value, pkg=pkg), pkg=pkg)
+    assert from_yaml(out, native_datetimes=False, pkg=pkg) == value
+
+
+FAST_FLOW_FALLBACKS = (
+    {'foo': date(2018, 5, 22)},
+    {1: 'foo'},
+    [1e100, 1e-10],
+    ['\U0001f600', '\x85', '\x7f'],
+    OrderedDict([('foo', 1)]),
+    (1, 2),
+    {'foo': {'k' * 1023: 1}},
+)
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+@pytest.mark.parametrize('value', FAST_FLOW_FALLBACKS)
+def test_fast_flow_fallback(pkg, value):
+    assert to_yaml(value, fast_flow=True, pkg=pkg) == to_yaml(value, pkg=pkg)
+    assert to_yaml(value, fast_flow=True, pretty=True, pkg=pkg) == to_yaml(value, pretty=True, pkg=pkg)
+
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+@pytest.mark.parametrize('key', ('k' * 1022, 'k' * 1023, 'k' * 5000, 'caf\xe9/' * 200))
+def test_fast_flow_long_keys(pkg, key):
+    value = {'foo': {key: [1]}, key: 2}
+    assert from_yaml(to_yaml(value, fast_flow=True, pkg=pkg), pkg=pkg) == value
+
+
+JSON_SHAPED = """
+  {
+    "null": null, "int": 123, "float": 12.34, "str": "foo", "bool": true,
+    "date": "2018-05-22", "time": "12:34:56",
+    "datetime_tz": "2018-05-22T12:34:56-04:56",
+    "2018-05-22": "a date key",
+    "list": [null, "2018-05-22", "12:34:56.000789", {"nested": "2018-05-22T12:34:56Z"}]
+  }
+"""
+
+NOT_JSON_SHAPED = (
+    '[foo, bar]',
+    '{foo: 2018-05-22}',
+    '[1, 2]\n# trailing comment',
+    'foo: [1, 2]',
+)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_parse_try_json(pkg):
+    for native in (True, False):
+        expected = from_yaml(JSON_SHAPED, native_datetimes=native, pkg=pkg)
+        assert from_yaml(JSON_SHAPED, native_datetimes=native, try_json=True, pkg=pkg) == expected
+
+    for value in NOT_JSON_SHAPED:
+        assert from_yaml(value, try_json=True, pkg=pkg) == from_yaml(value, pkg=pkg)
+
+    assert from_yaml(TYPED, try_json=True, into=TypedParent, pkg=pkg) == from_yaml(TYPED, into=TypedParent, pkg=pkg)
+
+
+DATE_KEYS = """
+base: &base {2018-05-22: foo, '12:34:56': bar}
+merged:
+  <<: *base
+  "2018-05-22T12:34:56Z": [2018-05-22, '12:34:56', !!str 2018-05-23, 2018-5-2]
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_parse_native_datetime_keys(pkg):
+    expected_values = [date(2018, 5, 22), time(12, 34, 56), '2018-05-23', '2018-5-2']
+    dt = timezone('UTC').localize(datetime(2018, 5, 22, 12, 34, 56))
+
+    result = from_yaml(DATE_KEYS, pkg=pkg)
+    assert result['base'] == {date(2018, 5, 22): 'foo', time(12, 34, 56): 'bar'}
+    assert result['merged'] == {
+        date(2018, 5, 22): 'foo',
+        time(12, 34, 56): 'bar',
+        dt: expected_values,
+    }
+
+    result = from_yaml(DATE_KEYS, native_datetime_keys=False, pkg=pkg)
+    assert result['base'] == {'2018-05-22': 'foo', '12:34:56': 'bar'}
+    assert result['merged'] == {
+        '2018-05-22': 'foo',
+        '12:34:56': 'bar',
+        '2018-05-22T12:34:56Z': expected_values,
+    }
+
+    result = from_yaml(DATE_KEYS, native_datetime_keys=False, try_json=True, pkg=pkg)
+    assert result['base'] == {'2018-05-22': 'foo', '12:34:56': 'bar'}
+    assert from_yaml('{"2018-05-22": "2018-05-22"}', native_datetime_keys=False, try_json=True, pkg=pkg) \
+        == {'2018-05-22': date(2018, 5, 22)}
+
+
+REPEATED_TYPES = (
+    (CustomNamedTuple(123), '{foo: 123}'),
+    (CustomUserDict(zzz=1, aaa=2), '{zzz: 1, aaa: 2}'),
+    (CustomDataclass(123), '{foo: 123, bar: baz}'),
+    (CustomSlots(123, 'baz'), '{foo: 123, bar: baz}'),
+    (CustomEnum.a_str, 'foo'),
+    (OrderedDict((('zzz', 1), ('aaa', 2))), '{zzz: 1, aaa: 2}'),
+)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_repeated_types(pkg):
+    nested = {'values': [value for value, _ in REPEATED_TYPES]}
+    first = to_yaml(nested, pkg=pkg)
+
+    for _ in range(3):
+        for value, expected in REPEATED_TYPES:
+            assert to_yaml(value, pkg=pkg).startswith(expected)
+        assert to_yaml(nested, pkg=pkg) == first
+
+    with pytest.raises(Exception):
+        to_yaml(object(), pkg=pkg)
+
+
+YAML_STREAM = """# leading comment
+%YAML 1.1
+---
+foo: 2018-05-22
+bar: &anchor [1, 2]
+baz: *anchor
+...
+%TAG !e! tag:example.com,2000:
+--- |
+  some text
+  --- not a marker
+---
+---
+{"2018-05-22": '12:34:56'}
+...
+# trailing comment
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_parse_all(pkg):
+    expected = [
+        {'foo': date(2018, 5, 22), 'bar': [1, 2], 'baz': [1, 2]},
+        'some text\n--- not a marker\n',
+        None,
+        {date(2018, 5, 22): time(12, 34, 56)},
+    ]
+    assert from_yaml_all(YAML_STREAM, pkg=pkg) == expected
+    assert from_yaml_all(StringIO(YAML_STREAM), pkg=pkg) == expected
+    assert from_yaml_all(YAML_STREAM * 5, workers=3, pkg=pkg) == expected * 5
+    assert from_yaml_all(YAML_STREAM * 5, workers=3, native_datetimes=False, pkg=pkg) \
+        == from_yaml_all(YAML_STREAM * 5, native_datetimes=False, pkg=pkg)
+    assert from_yaml_all(YAML_STREAM * 5, workers=3, native_datetime_keys=False, pkg=pkg)[3] \
+        == {'2018-05-22': time(12, 34, 56)}
+    assert from_yaml_all('', workers=2, pkg=pkg) == []
+
+    with pytest.raises(Exception):
+        from_yaml_all(YAML_STREAM + 'foo: [1\n', workers=2, pkg=pkg)
+
+    with pytest.raises(ValueError):
+        from_yaml_all(YAML_STREAM, workers=0, pkg=pkg)
+
+
+WORKER_STREAMS = (
+    '--- foo\n%TAG !e! tag:example.com,2000:\n--- bar\n',
+    'foo: 1\n%YAML 1.1\n---\nbar: 2\n' * 3,
+    '...\n',
+    '# comment\n...\n',
+    '...\nfoo: 1\n',
+    'foo: 1\n...\n...\n',
+    '--- foo\n...\n...\n--- bar\n',
+    '---\n...\n',
+    '',
+)
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+@pytest.mark.parametrize('stream', WORKER_STREAMS)
+def test_parse_all_workers_match_serial(pkg, stream):
+    try:
+        expected = from_yaml_all(stream, pkg=pkg)
+    except Exception as exc:
+        with pytest.raises(type(exc)):
+            from_yaml_all(stream, workers=2, pkg=pkg)
+    else:
+        assert from_yaml_all(stream, workers=2, pkg=pkg) == expected
+
+
+BILLION_LAUGHS = """
+a: &a ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]
+b: &b [*a, *a, *a, *a, *a, *a, *a, *a, *a]
+c: &c [*b, *b, *b, *b, *b, *b, *b, *b, *b]
+d: &d [*c, *c, *c, *c, *c, *c, *c, *c, *c]
+e: &e [*d, *d, *d, *d, *d, *d, *d, *d, *d]
+f: &f [*e, *e, *e, *e, *e, *e, *e, *e, *e]
+g: &g [*f, *f, *f, *f, *f, *f, *f, *f, *f]
+h: &h [*g, *g, *g, *g, *g, *g, *g, *g, *g]
+i: &i [*h, *h, *h, *h, *h, *h, *h, *h, *h]
+"""
+
+
+@pytest.mark.parametrize('pkg', AVAILABLE_YAML_PACKAGES)
+def test_limits(pkg):
+    value = 'foo: &foo [1, 2, {bar: 2018-05-22}]\nbaz: *foo\n'
+    expected = {'foo': [1, 2, {'bar': date(2018, 5, 22)}]}
+    expected['baz'] = expected['foo']
+
+    # 1 mapping, 2 keys, 6 nodes under foo, and 6 more through the alias.
+    assert from_yaml(value, pkg=pkg, max_bytes=len(value), max_depth=3, max_nodes=15, max_alias_expansions=6) == expected
+    assert from_yaml(StringIO(value), pkg=pkg, max_bytes=len(value)) == expected
+    with pytest.raises(LimitExceededError):
+        from_yaml(value, pkg=pkg, max_bytes=len(value) - 1)
+    with pytest.raises(LimitExceededError):
+        from_yaml(StringIO(value), pkg=pkg, max_bytes=len(value) - 1)
+    with pytest.raises(LimitExceededError):
+        from_yaml(value, pkg=pkg, max_depth=2)
+    with pytest.raises(LimitExceededError):
+        from_yaml(value, pkg=pkg, max_nodes=14)
+    with pytest.raises(LimitExceededError):
+        from_yaml(value, pkg=pkg, max_alias_expansions=5)
+
+    with pytest.raises(LimitExceededError):
+        from_yaml(BILLION_LAUGHS, pkg=pkg, max_alias_expansions=10000)
+    with pytest.raises(LimitExceededError):
+        from_yaml(BILLION_LAUGHS, pkg=pkg, max_nodes=10000)
+
+    with pytest.raises(LimitExceededError):
+        from_yaml('[[[[1]]]]', pkg=pkg, try_json=True, max_depth=3)
+    assert from_yaml('[[[[1]]]]', pkg=pkg, try_json=True, max_depth=4) == [[[[1]]]]
+
+    stream = 'foo: 1\n---\nfoo: [1, 2]\n'
+    assert from_yaml_all(stream, pkg=pkg, max_nodes=8) == [{'foo': 1}, {'foo': [1, 2]}]
+    with pytest.raises(LimitExceededError):
+        from_yaml_all(stream, pkg=pkg, max_nodes=7)
+    assert from_yaml_all(stream, pkg=pkg, workers=2, max_nodes=8) == [{'foo': 1}, {'foo': [1, 2]}]
+    with pytest.raises(LimitExceededError):
+        from_yaml_all(stream, pkg=pkg, workers=2, max_nodes=7)
+
+    output = to_yaml(expected['foo'], pkg=pkg)
+    assert to_yaml(expected['foo'], pkg=pkg, max_bytes=len(output), max_depth=2, max_nodes=6) == output
+    with pytest.raises(LimitExceededError):
+        to_yaml(expected['foo'], pkg=pkg, max_bytes=len(output) - 1)
+    with pytest.raises(LimitExceededError):
+        to_yaml(expected['foo'], pkg=pkg, max_depth=1)
+    with pytest.raises(LimitExceededError):
+        to_yaml(expected['foo'], pkg=pkg, max_nodes=5)